@@ -1,24 +1,88 @@
+import os
 from flask import Flask
 from flask_cors import CORS
 from .routes import main_bp
-from .models import db
+from .models import db, ensure_indexes
+from .chart_store import chart_store, forecast_store
+from lstm.batching import forecaster
+from .price_feed import price_feed
+from .news_cache import news_cache
+from .leaderboard import leaderboard
+from .storage import engine_options, apply_pragmas, migrate_sqlite, prediction_writer
+from .settlement import settlement
+from .utils import fetch_prices, fetch_news, fetch_minute_klines
+from ingest.config import CRYPTO_SYMBOLS
 
 def create_app():
     app = Flask(__name__)
     CORS(app, resources={r"/api/*": {"origins": "*"}})
     
     # Configuration
-    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///crypto_app.db'
+    app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL', 'sqlite:///crypto_app.db')
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    # SQLite profile (app/storage.py): 'production' = WAL + pragmas + pool, 'legacy' = defaults;
+    # ignored for other databases
+    app.config['SQLITE_PROFILE'] = os.getenv('SQLITE_PROFILE', 'production')
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(
+        app.config['SQLITE_PROFILE'], app.config['SQLALCHEMY_DATABASE_URI']
+    )
+    # Group-commit scored predictions from a background queue
+    app.config['PREDICTION_WRITE_BEHIND'] = os.getenv('PREDICTION_WRITE_BEHIND', '0') == '1'
+    app.config['PREDICTION_FLUSH_MS'] = float(os.getenv('PREDICTION_FLUSH_MS', 50))
+    app.config['PREDICTION_FLUSH_SIZE'] = int(os.getenv('PREDICTION_FLUSH_SIZE', 256))
+    # 'deferred': score predictions at prediction_time in bulk jobs; 'immediate': on submit
+    app.config['PREDICTION_SETTLEMENT'] = os.getenv('PREDICTION_SETTLEMENT', 'deferred')
+    # Coins /api/predict accepts (each is priced as <symbol>USDT on Binance)
+    app.config['SUPPORTED_SYMBOLS'] = tuple(CRYPTO_SYMBOLS)
+    app.config['SETTLEMENT_INTERVAL'] = float(os.getenv('SETTLEMENT_INTERVAL', 30))
+    app.config['OHLC_CACHE_PATH'] = os.getenv('OHLC_CACHE_PATH', 'ohlc_cache.sqlite')
+    app.config['CHART_DATA_PATH'] = os.path.join(
+        os.path.dirname(os.path.dirname(__file__)),
+        'backend', 'data', 'crypto_news_price_ohlc_dataset.parquet'
+    )
+    # /api/forecast reads the FinBERT-scored rows: the LSTM was trained on their sentiment
+    app.config['FORECAST_DATA_PATH'] = os.path.join(
+        os.path.dirname(os.path.dirname(__file__)),
+        'backend', 'data', 'crypto_news_price_sentiment.parquet'
+    )
+    # Load the chart dataset at startup instead of on the first chart request
+    app.config['CHART_PRELOAD'] = os.getenv('CHART_PRELOAD', '0') == '1'
+    # Default cap on /api/charts rows (LTTB-downsampled; ?max_points=0 returns all)
+    app.config['CHART_MAX_POINTS'] = int(os.getenv('CHART_MAX_POINTS', 2000))
+    # Micro-batching of concurrent /api/forecast requests (1 disables it)
+    app.config['FORECAST_MAX_BATCH'] = int(os.getenv('FORECAST_MAX_BATCH', 32))
+    app.config['FORECAST_MAX_WAIT_MS'] = float(os.getenv('FORECAST_MAX_WAIT_MS', 2))
+    # Ticker prices: max age served from memory, background refresh period (seconds)
+    app.config['PRICE_MAX_AGE'] = float(os.getenv('PRICE_MAX_AGE', 5))
+    app.config['PRICE_POLL_INTERVAL'] = float(os.getenv('PRICE_POLL_INTERVAL', 2))
+    # News: seconds before a background revalidation (NewsAPI free tier: 100 req/day)
+    app.config['NEWS_TTL'] = float(os.getenv('NEWS_TTL', 900))
+    # In-memory top-N; with several worker processes set a reload period (seconds)
+    app.config['LEADERBOARD_SIZE'] = 10
+    app.config['LEADERBOARD_MAX_AGE'] = float(os.getenv('LEADERBOARD_MAX_AGE', 0)) or None
     
     # Initialize extensions
     db.init_app(app)
+    chart_store.init_app(app)
+    forecast_store.init_app(app, 'FORECAST_DATA_PATH', 'forecast_store')
+    forecaster.init_app(app)
+    price_feed.init_app(app, fetch_prices)
+    news_cache.init_app(app, fetch_news)
+    leaderboard.init_app(app)
+    prediction_writer.init_app(app, on_commit=leaderboard.record_many)
+    settlement.init_app(app, fetch_minute_klines, on_commit=leaderboard.record_many)
     
     # Register blueprints
     app.register_blueprint(main_bp)
     
     # Create database tables
     with app.app_context():
+        apply_pragmas(db.engine, app.config['SQLITE_PROFILE'])
         db.create_all()
+        migrate_sqlite()
+        ensure_indexes()
+        leaderboard.reload()
+    if app.config['PREDICTION_SETTLEMENT'] == 'deferred':
+        settlement.start()
     
     return app 
\ No newline at end of file
@@ -0,0 +1,249 @@
+import hashlib
+import os
+import threading
+from datetime import datetime, timezone
+
+import numpy as np
+
+# ────────────────────────────────
+# Column naming expected by the React components
+# ────────────────────────────────
+RENAMES = {'price_usd': 'price', 'volume_24h': 'volume'}
+# FinBERT labels -> sign of sentiment_num, as in csv_preprocess.py
+SENTIMENT_SIGN = {'positive': 1, 'neutral': 0, 'negative': -1}
+
+
+class CoinSeries:
+    """
+    Read-only view of one coin's rows, ordered by timestamp.
+
+    Every entry of `columns` is a slice of a contiguous array shared by the
+    whole store, so building a CoinSeries never copies data. String columns
+    are also kept dictionary-encoded in `codes` (-1 for missing values).
+    """
+
+    def __init__(self, coin, timestamp, iso, columns, codes=None):
+        self.coin = coin
+        self.timestamp = timestamp  # datetime64[ns], UTC
+        self.iso = iso              # pre-rendered ISO-8601 strings
+        self.columns = columns      # name -> ndarray
+        self.codes = codes or {}    # name -> (int32 codes, store-wide values)
+
+    def __len__(self):
+        return len(self.timestamp)
+
+    @property
+    def close(self):
+        return self.columns.get('close')
+
+    def bounds(self, start=None, end=None):
+        """
+        [lo, hi) row range with start <= timestamp <= end, by binary search
+        on the sorted timestamps. `start`/`end` are datetime64 or None.
+        """
+        lo = 0 if start is None else int(np.searchsorted(self.timestamp, start, side='left'))
+        hi = len(self) if end is None else int(np.searchsorted(self.timestamp, end, side='right'))
+        return lo, max(lo, hi)
+
+    def records(self, start=0, stop=None, index=None):
+        """
+        Rows in [start, stop), or the rows at `index`, as JSON-ready dicts
+        (NaN rendered as None).
+        """
+        pick = slice(start, stop) if index is None else index
+        names = list(self.columns)
+        values = [self.iso[pick].tolist()]
+        values += [_json_values(self.columns[name][pick]) for name in names]
+        keys = ['timestamp'] + names
+        return [dict(zip(keys, row)) for row in zip(*values)]
+
+    def dictionary(self, name, index):
+        """
+        The string column `name` at `index` as (codes, values): int codes
+        into a list holding only the distinct values used, -1 for missing.
+        """
+        codes, values = self.codes[name]
+        picked = codes[index]
+        used = np.unique(picked)
+        used = used[used >= 0]
+        local = np.where(picked >= 0, np.searchsorted(used, picked), -1).astype(np.int32)
+        return local, values[used].tolist()
+
+    def columnar(self, index, extra=None):
+        """
+        Rows at `index` as parallel arrays: numeric columns as arrays,
+        timestamps as epoch ms, string columns dictionary-encoded. `extra`
+        adds more same-length arrays (e.g. MACD).
+        """
+        columns = {'timestamp': self.timestamp[index].view('i8') // 1_000_000}
+        dictionaries = {}
+        for name, arr in self.columns.items():
+            if name in self.codes:
+                columns[name], dictionaries[name] = self.dictionary(name, index)
+            else:
+                columns[name] = arr[index]
+        for name, arr in (extra or {}).items():
+            columns[name] = arr
+        return {'length': len(index), 'columns': columns, 'dictionaries': dictionaries}
+
+    def arrow(self, index, extra=None):
+        """Rows at `index` (plus `extra` arrays) as an Arrow IPC stream."""
+        import pyarrow as pa
+
+        arrays = {'timestamp': pa.array(self.timestamp[index], type=pa.timestamp('ms', tz='UTC'))}
+        for name, arr in self.columns.items():
+            if name in self.codes:
+                codes, values = self.dictionary(name, index)
+                mask = codes < 0
+                arrays[name] = pa.DictionaryArray.from_arrays(
+                    pa.array(codes, mask=mask), pa.array(values, type=pa.string())
+                )
+            else:
+                arrays[name] = pa.array(arr[index], from_pandas=True)
+        for name, arr in (extra or {}).items():
+            arrays[name] = pa.array(arr, from_pandas=True)
+        table = pa.table(arrays)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+
+
+def _json_values(arr):
+    if arr.dtype.kind == 'f':
+        return np.where(np.isnan(arr), None, arr).tolist()
+    return arr.tolist()
+
+
+def _sentiment(df):
+    """The training sentiment feature (label sign x score), NaN when the data is unscored."""
+    if 'sentiment_num' in df.columns:
+        return df['sentiment_num'].astype(float)
+    if {'sentiment_label', 'sentiment_score'} <= set(df.columns):
+        return df['sentiment_label'].map(SENTIMENT_SIGN) * df['sentiment_score']
+    return np.nan
+
+
+def _partition(df):
+    import pandas as pd
+
+    df = df.rename(columns=RENAMES)
+    if 'volume' not in df.columns:
+        df['volume'] = 0
+    df['sentiment'] = _sentiment(df)
+
+    df = df.sort_values(['coin', 'timestamp'], kind='stable').reset_index(drop=True)
+
+    ts = df['timestamp']
+    if ts.dt.tz is not None:
+        ts = ts.dt.tz_convert('UTC').dt.tz_localize(None)
+    timestamp = np.ascontiguousarray(ts.to_numpy(dtype='datetime64[ns]'))
+    iso = np.char.add(np.datetime_as_string(timestamp, unit='ms'), 'Z').astype(object)
+
+    columns = {}
+    codes = {}
+    for name in df.columns:
+        if name == 'timestamp':
+            continue
+        arr = df[name].to_numpy()
+        if arr.dtype.kind not in 'fiub':
+            # strings: normalise missing values once instead of per request
+            arr = arr.astype(object)
+            arr[pd.isna(arr)] = None
+            # ... and dictionary-encode them for the columnar formats
+            c, values = pd.factorize(arr, use_na_sentinel=True)
+            codes[name] = (c.astype(np.int32), np.asarray(values, dtype=object))
+        columns[name] = np.ascontiguousarray(arr)
+
+    coins = columns['coin']
+    uniq, starts = np.unique(coins, return_index=True)
+    order = np.argsort(starts)
+    uniq, starts = uniq[order], starts[order]
+    stops = np.append(starts[1:], len(coins))
+
+    return {
+        coin: CoinSeries(
+            coin,
+            timestamp[lo:hi],
+            iso[lo:hi],
+            {name: arr[lo:hi] for name, arr in columns.items()},
+            {name: (c[lo:hi], values) for name, (c, values) in codes.items()},
+        )
+        for coin, lo, hi in zip(uniq.tolist(), starts, stops)
+    }
+
+
+class ChartStore:
+    """
+    Process-wide, coin-partitioned copy of the chart dataset.
+
+    The dataset (Parquet, or the legacy CSV) is read on the first chart
+    request (or when the app is created, with CHART_PRELOAD) and again only
+    when its modification time changes; requests are served from the
+    in-memory arrays. pandas and pyarrow are only imported by that load.
+
+    The loaded series and the file's mtime (the store `version`) are
+    swapped together, so a reader always gets a series with the version it
+    came from, even while a reload lands.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self._snapshot = ({}, None)  # (coin -> CoinSeries, mtime_ns)
+        self._lock = threading.Lock()
+
+    def init_app(self, app, path_key='CHART_DATA_PATH', name='chart_store'):
+        self.path = app.config[path_key]
+        app.extensions[name] = self
+        if app.config.get('CHART_PRELOAD'):
+            self.refresh()
+
+    def refresh(self):
+        from dataset import read_table, resolve
+
+        path = resolve(self.path)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            return
+        if mtime == self._snapshot[1]:
+            return
+        with self._lock:
+            if mtime != self._snapshot[1]:
+                self._snapshot = (_partition(read_table(path)), mtime)
+
+    @property
+    def version(self):
+        """mtime_ns of the loaded dataset, or None before the first load."""
+        return self._snapshot[1]
+
+    @staticmethod
+    def last_modified(version):
+        """Modification time (UTC) of the dataset at `version`, or None."""
+        if version is None:
+            return None
+        return datetime.fromtimestamp(version // 1_000_000_000, timezone.utc)
+
+    @staticmethod
+    def etag(version, *parts):
+        """
+        Validator for a response derived from the dataset at `version`:
+        changes when the file does and differs per `parts` (coin, query, format).
+        """
+        digest = hashlib.sha1(repr((version,) + parts).encode()).hexdigest()[:20]
+        return digest
+
+    def coins(self):
+        self.refresh()
+        return list(self._snapshot[0])
+
+    def get(self, coin):
+        """(series, version) for `coin` from one snapshot; series is None if unknown."""
+        self.refresh()
+        series, version = self._snapshot
+        return series.get(coin), version
+
+
+chart_store = ChartStore()
+# The scored (FinBERT) dataset the LSTM's sentiment feature comes from
+forecast_store = ChartStore()
@@ -0,0 +1,36 @@
+import numpy as np
+
+
+def lttb(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets downsampling.
+
+    Returns the indices of `n_out` points of the series (x, y) that best
+    preserve its visual shape: the first and last points are always kept,
+    and from each of the n_out - 2 equal-sized buckets in between the point
+    forming the largest triangle with the previously kept point and the
+    mean of the next bucket. `x` must be increasing; NaN `y` are skipped.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    valid = np.flatnonzero(~np.isnan(y))
+    n = len(valid)
+    if n_out >= n or n_out < 3:
+        return valid
+    xv, yv = x[valid], y[valid]
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)  # n_out - 2 buckets over [1, n-1)
+    out = np.empty(n_out, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # mean of the next bucket (the last point for the final bucket)
+        nlo, nhi = hi, edges[i + 2] if i + 2 < len(edges) else n
+        cx, cy = xv[nlo:nhi].mean(), yv[nlo:nhi].mean()
+        ax, ay = xv[a], yv[a]
+        area = np.abs((ax - cx) * (yv[lo:hi] - ay) - (ax - xv[lo:hi]) * (cy - ay))
+        a = lo + int(np.argmax(area))
+        out[i + 1] = a
+    return valid[out]
@@ -0,0 +1,82 @@
+import threading
+import time
+
+from .models import db, User
+
+
+class Leaderboard:
+    """
+    Top-N users by points, kept in memory.
+
+    Loaded once from the database (through the User.points index) and then
+    updated from every scored prediction, so reads never query. A member
+    whose total drops may hide a user outside the list who now ranks
+    higher; only then is the list reloaded, on the next read.
+
+    The copy is per process: with several workers, another process's
+    updates show up after `max_age` seconds (None: never reload).
+    """
+
+    def __init__(self, size=10, max_age=None):
+        self.size = size
+        self.max_age = max_age
+        self._entries = {}    # user_id -> (username, points)
+        self._ranked = []     # JSON-ready rows, best first
+        self._stale = True
+        self._loaded = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.size = app.config.get('LEADERBOARD_SIZE', self.size)
+        self.max_age = app.config.get('LEADERBOARD_MAX_AGE', self.max_age)
+        app.extensions['leaderboard'] = self
+
+    def top(self):
+        if self._stale or (self.max_age is not None and time.monotonic() - self._loaded > self.max_age):
+            self.reload()
+        return self._ranked
+
+    def reload(self):
+        rows = (
+            db.session.query(User.id, User.username, User.points)
+            .order_by(User.points.desc(), User.id)
+            .limit(self.size)
+            .all()
+        )
+        with self._lock:
+            self._entries = {uid: (name, points or 0) for uid, name, points in rows}
+            self._rank()
+            self._stale = False
+            self._loaded = time.monotonic()
+
+    def record(self, user_id, username, points):
+        """Fold in a user's new total."""
+        with self._lock:
+            if self._stale:
+                return
+            floor = min((p for _, p in self._entries.values()), default=None)
+            if user_id in self._entries:
+                old = self._entries[user_id][1]
+                self._entries[user_id] = (username, points)
+                if points < old and len(self._entries) == self.size and points < floor:
+                    self._stale = True  # someone outside the list may now rank higher
+                    return
+            elif len(self._entries) < self.size or points > floor:
+                self._entries[user_id] = (username, points)
+                if len(self._entries) > self.size:
+                    worst = min(self._entries, key=lambda uid: (self._entries[uid][1], -uid))
+                    del self._entries[worst]
+            else:
+                return
+            self._rank()
+
+    def record_many(self, totals):
+        for user_id, username, points in totals:
+            self.record(user_id, username, points)
+
+    def _rank(self):
+        order = sorted(self._entries.items(), key=lambda kv: (-kv[1][1], kv[0]))
+        self._ranked = [{'username': name, 'points': points} for _, (name, points) in order]
+
+
+leaderboard = Leaderboard()
@@ -7,16 +7,27 @@ class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(80), unique=True, nullable=False)
     password = db.Column(db.String(120), nullable=False)
-    points = db.Column(db.Integer, default=0)
+    points = db.Column(db.Integer, default=0, index=True)
     predictions = db.relationship('Prediction', backref='user', lazy=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
 class Prediction(db.Model):
+    # pending settlement: unscored rows, oldest prediction_time first
+    __table_args__ = (db.Index('ix_prediction_pending', 'settled_at', 'prediction_time'),)
+
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
-    crypto_symbol = db.Column(db.String(10), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
+    crypto_symbol = db.Column(db.String(10), nullable=False, index=True)
     predicted_price = db.Column(db.Float, nullable=False)
-    actual_price = db.Column(db.Float, nullable=False)
+    actual_price = db.Column(db.Float)  # NULL until settled
     prediction_time = db.Column(db.DateTime, nullable=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    points_earned = db.Column(db.Integer, default=0) 
\ No newline at end of file
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    points_earned = db.Column(db.Integer, default=0)
+    settled_at = db.Column(db.DateTime)
+
+
+def ensure_indexes():
+    """Create declared indexes missing from an existing database (create_all skips existing tables)."""
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=db.engine, checkfirst=True) 
\ No newline at end of file
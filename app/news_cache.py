@@ -0,0 +1,95 @@
+import logging
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from concurrent.futures import Future
+
+log = logging.getLogger(__name__)
+
+
+def _cutoff(window):
+    return (datetime.now(timezone.utc) - window).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+class NewsCache:
+    """
+    Server-side copy of the news feed, deduplicated by URL.
+
+    `source(since)` returns articles (newest first) published at or after
+    the ISO timestamp `since`, or the default window when `since` is None.
+    Reads within `ttl` seconds of the last fetch are served from memory;
+    after that the cached list is still served immediately while one
+    background refresh asks upstream only for articles newer than the
+    latest cached `publishedAt`. Only an empty cache makes a reader wait,
+    and concurrent readers share that fetch.
+    """
+
+    def __init__(self, source=None, ttl=900.0, window=timedelta(days=1), retry_after=60.0):
+        self.source = source
+        self.ttl = ttl
+        self.window = window
+        self.retry_after = retry_after
+        self._articles = {}       # url -> article
+        self._feed = []           # articles newest first, what readers get
+        self._fetched = None      # monotonic time of the last successful fetch
+        self._failed = None       # monotonic time of the last failed fetch
+        self._inflight = None     # Future of the fetch in progress
+        self._lock = threading.Lock()
+        self.upstream_calls = 0
+
+    def init_app(self, app, source=None):
+        self.source = source or self.source
+        self.ttl = app.config.get('NEWS_TTL', self.ttl)
+        app.extensions['news_cache'] = self
+
+    def get(self, timeout=30.0):
+        now = time.monotonic()
+        with self._lock:
+            fresh = self._fetched is not None and now - self._fetched <= self.ttl
+            backoff = self._failed is not None and now - self._failed <= self.retry_after
+            if fresh or (self._fetched is not None and backoff):
+                return self._feed
+            future = self._inflight
+            leader = future is None
+            if leader:
+                future = self._inflight = Future()
+            stale = self._feed if self._fetched is not None else None
+
+        if leader:
+            if stale is not None:
+                threading.Thread(target=self._refresh, args=(future,), name='news-refresh', daemon=True).start()
+            else:
+                self._refresh(future)
+        if stale is not None:
+            return stale  # stale-while-revalidate
+        return future.result(timeout)
+
+    def _refresh(self, future):
+        with self._lock:
+            since = self._feed[0]['publishedAt'] if self._feed else None
+        try:
+            self.upstream_calls += 1
+            articles = self.source(since)
+        except Exception as e:
+            log.warning(f"news refresh failed: {e}")
+            with self._lock:
+                self._failed = time.monotonic()
+                self._inflight = None
+            future.set_exception(e)
+            return
+
+        with self._lock:
+            for article in articles:
+                if article.get('url'):
+                    self._articles[article['url']] = article
+            cutoff = _cutoff(self.window)
+            self._articles = {u: a for u, a in self._articles.items() if (a.get('publishedAt') or '') >= cutoff}
+            self._feed = sorted(self._articles.values(), key=lambda a: a.get('publishedAt') or '', reverse=True)
+            self._fetched = time.monotonic()
+            self._failed = None
+            self._inflight = None
+            feed = self._feed
+        future.set_result(feed)
+
+
+news_cache = NewsCache()
@@ -0,0 +1,91 @@
+import logging
+import threading
+import time
+from concurrent.futures import Future
+
+log = logging.getLogger(__name__)
+
+
+class PriceFeed:
+    """
+    Latest price per symbol, kept in memory with a freshness bound.
+
+    `source(symbols)` returns {symbol: price} in one upstream round-trip.
+    Once a symbol has been asked for, a background poller keeps it fresh;
+    a read that finds no price younger than `max_age` fetches it
+    synchronously, and concurrent misses for the same symbol share that
+    one fetch instead of each calling upstream.
+    """
+
+    def __init__(self, source=None, max_age=5.0, poll_interval=2.0):
+        self.source = source
+        self.max_age = max_age
+        self.poll_interval = poll_interval
+        self._prices = {}      # symbol -> (price, monotonic time fetched)
+        self._inflight = {}    # symbol -> Future of the fetch in progress
+        self._lock = threading.Lock()
+        self._poller = None
+        self._stop = threading.Event()
+        self.upstream_calls = 0
+
+    def init_app(self, app, source=None):
+        self.source = source or self.source
+        self.max_age = app.config.get('PRICE_MAX_AGE', self.max_age)
+        self.poll_interval = app.config.get('PRICE_POLL_INTERVAL', self.poll_interval)
+        app.extensions['price_feed'] = self
+
+    def get(self, symbol, timeout=10.0):
+        with self._lock:
+            cached = self._prices.get(symbol)
+            if cached is not None and time.monotonic() - cached[1] <= self.max_age:
+                return cached[0]
+            future = self._inflight.get(symbol)
+            leader = future is None
+            if leader:
+                future = self._inflight[symbol] = Future()
+        self._ensure_poller()
+
+        if leader:
+            try:
+                price = self._fetch([symbol])[symbol]
+            except Exception as e:
+                future.set_exception(e)
+            else:
+                future.set_result(price)
+            finally:
+                with self._lock:
+                    self._inflight.pop(symbol, None)
+        return future.result(timeout)
+
+    def _fetch(self, symbols):
+        self.upstream_calls += 1
+        prices = self.source(symbols)
+        now = time.monotonic()
+        with self._lock:
+            for symbol, price in prices.items():
+                self._prices[symbol] = (price, now)
+        return prices
+
+    def _ensure_poller(self):
+        if self._poller is None and self.poll_interval:
+            with self._lock:
+                if self._poller is None:
+                    self._poller = threading.Thread(target=self._poll, name='price-feed', daemon=True)
+                    self._poller.start()
+
+    def _poll(self):
+        while not self._stop.wait(self.poll_interval):
+            with self._lock:
+                symbols = list(self._prices)
+            if not symbols:
+                continue
+            try:
+                self._fetch(symbols)
+            except Exception as e:  # keep polling; reads fall back to a direct fetch
+                log.warning(f"price poll failed: {e}")
+
+    def stop(self):
+        self._stop.set()
+
+
+price_feed = PriceFeed()
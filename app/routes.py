@@ -1,22 +1,27 @@
-from flask import Blueprint, json, jsonify, request, current_app
+from flask import Blueprint, jsonify, request, current_app
 from flask_cors import cross_origin
 from .models import db, User, Prediction
-import os
+from .chart_store import chart_store, forecast_store
+from .news_cache import news_cache
+from .leaderboard import leaderboard
+from .storage import prediction_writer
+from .settlement import score, utc_naive
+from .downsample import lttb
+from .serialize import json_response, dumps, cached_response
 from datetime import datetime
-import torch
-import pandas as pd
 import numpy as np
 from .utils import (
-    preprocess_data,
-    get_macd,
-    fetch_news,
+    macd_cache,
     get_current_price,
-    generate_features,
-    make_predictions
+    seed_online_features,
+    predict_latest
 )
 
 main_bp = Blueprint('main', __name__)
 
+# Arrow IPC stream, served by /api/charts when the client asks for it
+ARROW_MIME = 'application/vnd.apache.arrow.stream'
+
 @main_bp.route('/api/register', methods=['POST'])
 def register():
     data = request.get_json()
@@ -29,6 +34,7 @@ def register():
     user = User(username=username, password=password)
     db.session.add(user)
     db.session.commit()
+    leaderboard.record(user.id, user.username, user.points or 0)
     
     return jsonify({'message': 'User registered successfully'}), 201
 
@@ -48,32 +54,64 @@ def login():
 def predict():
     data = request.get_json()
     user_id = data.get('user_id')
-    crypto_symbol = data.get('crypto_symbol')
+    crypto_symbol = str(data.get('crypto_symbol') or '').upper()
     predicted_price = data.get('predicted_price')
-    prediction_time = datetime.fromisoformat(data.get('prediction_time'))
-    
-    # Get actual price from Binance API
-    actual_price = get_current_price(crypto_symbol)
-    
-    # Calculate points based on prediction accuracy
-    accuracy = abs(predicted_price - actual_price) / actual_price
-    points = int((1 - accuracy) * 100)  # Max 100 points for perfect prediction
-    
-    prediction = Prediction(
+    if crypto_symbol not in current_app.config['SUPPORTED_SYMBOLS']:
+        return jsonify({'error': f'Unsupported crypto_symbol: {data.get("crypto_symbol")}'}), 400
+    prediction_time = utc_naive(datetime.fromisoformat(data.get('prediction_time')))
+
+    row = dict(
         user_id=user_id,
         crypto_symbol=crypto_symbol,
         predicted_price=predicted_price,
-        actual_price=actual_price,
-        prediction_time=prediction_time,
-        points_earned=points
+        prediction_time=prediction_time
     )
+    deferred = current_app.config['PREDICTION_SETTLEMENT'] == 'deferred'
+    write_behind = prediction_writer.enabled
+    if (deferred or write_behind) and db.session.get(User, user_id) is None:
+        return jsonify({'error': 'User not found'}), 404
+
+    if deferred:
+        # stored unscored; app/settlement.py prices it at prediction_time in bulk
+        accepted = {'message': 'Prediction accepted', 'settles_after': prediction_time.isoformat() + 'Z'}
+        if write_behind:
+            prediction_writer.submit(row)
+            return jsonify(accepted), 202
+        prediction = Prediction(**row)
+        db.session.add(prediction)
+        db.session.commit()
+        return jsonify({**accepted, 'prediction_id': prediction.id}), 202
+
+    # Get actual price from Binance API
+    actual_price = get_current_price(crypto_symbol)
     
-    # Update user's total points
-    user = User.query.get(user_id)
-    user.points += points
-    
-    db.session.add(prediction)
+    # Calculate points based on prediction accuracy
+    points = score(predicted_price, actual_price)  # Max 100 points for perfect prediction
+    row.update(actual_price=actual_price, points_earned=points, settled_at=datetime.utcnow())
+
+    if write_behind:
+        # write-behind: committed with other predictions by app/storage.py
+        prediction_writer.submit(row)
+        return jsonify({
+            'message': 'Prediction recorded',
+            'actual_price': actual_price,
+            'points_earned': points
+        }), 201
+
+    # Update user's total points: one atomic UPDATE ... RETURNING, no read-modify-write
+    updated = db.session.execute(
+        db.update(User)
+        .where(User.id == user_id)
+        .values(points=db.func.coalesce(User.points, 0) + points)
+        .returning(User.id, User.username, User.points)
+    ).one_or_none()
+    if updated is None:
+        db.session.rollback()
+        return jsonify({'error': 'User not found'}), 404
+
+    db.session.add(Prediction(**row))
     db.session.commit()
+    leaderboard.record(updated.id, updated.username, updated.points)
     
     return jsonify({
         'message': 'Prediction recorded',
@@ -81,59 +119,133 @@ def predict():
         'points_earned': points
     }), 201
 
+@main_bp.route('/api/predictions/<int:prediction_id>', methods=['GET'])
+def get_prediction(prediction_id):
+    prediction = db.session.get(Prediction, prediction_id)
+    if prediction is None:
+        return jsonify({'error': 'Prediction not found'}), 404
+    return jsonify({
+        'id': prediction.id,
+        'crypto_symbol': prediction.crypto_symbol,
+        'predicted_price': prediction.predicted_price,
+        'prediction_time': prediction.prediction_time.isoformat() + 'Z',
+        'settled': prediction.settled_at is not None,
+        # settled without a price: the minute could never be priced, no points
+        'void': prediction.settled_at is not None and prediction.actual_price is None,
+        'actual_price': prediction.actual_price,
+        'points_earned': prediction.points_earned
+    }), 200
+
 @main_bp.route('/api/leaderboard', methods=['GET'])
-def leaderboard():
-    users = User.query.order_by(User.points.desc()).limit(10).all()
-    return jsonify([{
-        'username': user.username,
-        'points': user.points
-    } for user in users]), 200
+def get_leaderboard():
+    # served from the in-memory top-N, updated by /api/predict
+    return jsonify(leaderboard.top()), 200
+
+def _parse_time(value):
+    """ISO-8601 string or epoch milliseconds -> naive UTC datetime64, or None."""
+    if value is None or value == '':
+        return None
+    import pandas as pd
+
+    ts = pd.Timestamp(int(value), unit='ms') if value.lstrip('-').isdigit() else pd.Timestamp(value)
+    if ts.tzinfo is not None:
+        ts = ts.tz_convert('UTC').tz_localize(None)
+    return ts.to_datetime64()
 
 @main_bp.route('/api/charts/<crypto_symbol>', methods=['GET'])
 @cross_origin()
 def get_charts(crypto_symbol):
-    # 1) load CSV from project root (drop the bogus 'backend' folder)
-    base = os.path.dirname(os.path.dirname(__file__))  
-    path = os.path.join(base, 'backend', 'data', 'crypto_news_price_ohlc_dataset.csv')
-
-    # 2) filter for symbol
-    df = pd.read_csv(path, parse_dates=['timestamp'])
-    df = df[df['coin'] == crypto_symbol]
-    current_app.logger.debug(f"get_charts: {crypto_symbol} → {len(df)} rows")
-
-    # 3) rename price_usd→price for your front-end
-    if 'price_usd' in df.columns:
-        df = df.rename(columns={'price_usd':'price'})
-
-    # 4) inject the fields your React component expects
-    #    — if you have real volume or sentiment in your CSV you can
-    #      rename/use those; otherwise placeholders:
-
-    if 'volume_24h' in df.columns:
-        df = df.rename(columns={'volume_24h': 'volume'})
-    df['volume']    = df.get('volume', 0)           # placeholder zero if no column
-    df['sentiment'] = df.get('sentiment_num', 0)    # or df['sentiment_num'] if present
-
-
-    # 5) MACD
-    macd = get_macd(df)
-
-    # 6) Costruiamo un JSON serializzabile
-    response_payload = {
-        'historical_data': json.loads(
-            df.to_json(orient='records', date_format='iso')  # ← timestamp in ISO
-        ),
-        # convertiamo le Series/ndarray in liste di float nativi
-        'macd': {k: [float(x) for x in v] for k, v in macd.items()},
-        'predictions': []
-    }
-    return jsonify(response_payload), 200
+    try:
+        start = _parse_time(request.args.get('start'))
+        end = _parse_time(request.args.get('end'))
+        max_points = int(request.args.get('max_points', current_app.config['CHART_MAX_POINTS']))
+    except ValueError as e:
+        return jsonify({'error': f'Invalid query parameter: {e}'}), 400
+    if max_points < 0 or 0 < max_points < 3:
+        # LTTB always keeps the first and last point plus one per bucket
+        return jsonify({'error': 'max_points must be 0 (all rows) or at least 3'}), 400
+
+    fmt = request.args.get('format')
+    if fmt is None:
+        best = request.accept_mimetypes.best_match(['application/json', ARROW_MIME])
+        fmt = 'arrow' if best == ARROW_MIME else 'rows'
+    if fmt not in ('rows', 'columnar', 'arrow'):
+        return jsonify({'error': f'Unknown format: {fmt}'}), 400
+
+    # 1) per-coin arrays from the in-memory store (reloaded if the CSV changed)
+    series, version = chart_store.get(crypto_symbol)
+    if series is None:
+        return json_response({
+            'historical_data': [],
+            'macd': {'macd': [], 'signal': [], 'histogram': []},
+            'predictions': []
+        })
+
+    def build():
+        # 2) [start, end] by binary search, then LTTB down to max_points (0: all rows)
+        lo, hi = series.bounds(start, end)
+        index = np.arange(lo, hi)
+        if max_points and hi - lo > max_points:
+            index = lo + lttb(series.timestamp[lo:hi].view('i8'), series.close[lo:hi], max_points)
+        current_app.logger.debug(f"get_charts: {crypto_symbol} → {len(index)} of {len(series)} rows")
+
+        # 3) MACD over the full history (cached, extended only by new bars), same rows
+        macd = {k: v[index] for k, v in macd_cache.get(crypto_symbol, series.close).items()}
+
+        # 4) one encoding pass (orjson when installed; arrays are not copied to lists)
+        if fmt == 'arrow':
+            return series.arrow(index, extra=macd)
+        if fmt == 'columnar':
+            historical = {'format': 'columnar', **series.columnar(index)}
+        else:
+            historical = series.records(index=index)
+        return dumps({'historical_data': historical, 'macd': macd, 'predictions': []})
+
+    # ETag / Last-Modified follow the snapshot the body is built from, so
+    # unchanged data answers 304 and a reload mid-request is never mislabelled
+    etag = chart_store.etag(version, crypto_symbol, start, end, max_points, fmt)
+    mimetype = ARROW_MIME if fmt == 'arrow' else 'application/json'
+    return cached_response(request, etag, chart_store.last_modified(version), mimetype, build)
+
+@main_bp.route('/api/forecast/<crypto_symbol>', methods=['GET'])
+@cross_origin()
+def get_forecast(crypto_symbol):
+    series, version = forecast_store.get(crypto_symbol)
+    if series is None:
+        return jsonify({'error': f'Unknown coin: {crypto_symbol}'}), 404
+    if np.isnan(series.columns['sentiment']).all():
+        # the model needs FinBERT scores; a placeholder would give a meaningless number
+        return jsonify({'error': 'No scored sentiment available for this coin'}), 503
+
+    # online features are seeded from the scored data, then batched into the LSTM
+    seed_online_features(crypto_symbol, series, version)
+    try:
+        prediction = predict_latest(crypto_symbol)
+    except TimeoutError:
+        current_app.logger.error(f"forecast {crypto_symbol}: timed out waiting for the model")
+        return jsonify({'error': 'Forecast timed out, try again'}), 503
+    except Exception as e:
+        # model load or forward pass failed (missing/unscaled weights, bad artifact, ...)
+        current_app.logger.error(f"forecast {crypto_symbol} failed: {e}")
+        return jsonify({'error': 'Forecast model unavailable'}), 503
+    if prediction is None:
+        return jsonify({'error': 'Not enough data to form a sequence (requires at least 20 rows)'}), 422
+
+    close = float(series.close[-1])
+    return jsonify({
+        'coin': crypto_symbol,
+        'timestamp': series.iso[-1],
+        'close': close,
+        'predicted_return_60m': prediction,
+        'predicted_price': close * (1 + prediction)
+    }), 200
 
 @main_bp.route('/api/news', methods=['GET'])
 @cross_origin()
 def get_news():
     try:
-        news = fetch_news()
+        # served from memory; refreshed upstream in the background (app/news_cache.py)
+        news = news_cache.get()
     except Exception as e:
         # log the underlying error so you can diagnose it, but don't 500
         current_app.logger.error(f"📰 fetch_news failed: {e}")
@@ -0,0 +1,124 @@
+import gzip
+import threading
+from collections import OrderedDict
+
+from flask import Response, json
+
+try:  # optional: ~10x faster and encodes numpy arrays natively
+    import orjson
+except ImportError:
+    orjson = None
+
+try:  # optional: smaller than gzip for text payloads
+    import brotli
+except ImportError:
+    brotli = None
+
+# Bodies smaller than this are sent as is
+MIN_COMPRESS = 1024
+
+
+def dumps(payload):
+    """
+    JSON bytes in one pass. numpy arrays are written as lists and NaN as
+    null; with orjson the arrays are encoded without a Python list copy.
+    """
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(payload, default=_numpy_default).encode()
+
+
+def _numpy_default(obj):
+    if hasattr(obj, 'tolist'):
+        values = obj.tolist()
+        if getattr(obj, 'dtype', None) is not None and obj.dtype.kind == 'f':
+            return [None if v != v else v for v in values]
+        return values
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def json_response(payload, status=200):
+    return Response(dumps(payload), status=status, mimetype='application/json')
+
+
+# ────────────────────────────────
+# Compression and conditional requests
+# ────────────────────────────────
+def negotiate_encoding(accept_encoding):
+    """'br', 'gzip' or None, from the request's Accept-Encoding."""
+    if brotli is not None and accept_encoding['br']:
+        return 'br'
+    if accept_encoding['gzip']:
+        return 'gzip'
+    return None
+
+
+def compress(body, encoding):
+    if encoding == 'br':
+        return brotli.compress(body, quality=5)
+    if encoding == 'gzip':
+        return gzip.compress(body, compresslevel=6)
+    return body
+
+
+class BodyCache:
+    """Small LRU of encoded (and compressed) bodies keyed by ETag and encoding."""
+
+    def __init__(self, capacity=128):
+        self.capacity = capacity
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            body = self._items.get(key)
+            if body is not None:
+                self._items.move_to_end(key)
+            return body
+
+    def put(self, key, body):
+        with self._lock:
+            self._items[key] = body
+            self._items.move_to_end(key)
+            while len(self._items) > self.capacity:
+                self._items.popitem(last=False)
+
+
+body_cache = BodyCache()
+
+
+def cached_response(request, etag, last_modified, mimetype, build):
+    """
+    Conditional, compressed response for a body that only changes with
+    `etag`: 304 when the client's If-None-Match / If-Modified-Since still
+    match, otherwise `build()` bytes, compressed per Accept-Encoding and
+    cached so repeated loads skip both the encoding and the compression.
+    """
+    response = Response(status=304, mimetype=mimetype)
+    response.set_etag(etag, weak=True)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    response.cache_control.no_cache = True  # always revalidate, 304 when unchanged
+    response.vary.update(('Accept', 'Accept-Encoding'))
+    if request.if_none_match.contains_weak(etag) or (
+        not request.if_none_match and last_modified is not None
+        and request.if_modified_since is not None and last_modified <= request.if_modified_since
+    ):
+        return response
+
+    key = (etag, negotiate_encoding(request.accept_encodings))
+    cached = body_cache.get(key)
+    if cached is None:
+        body, encoding = build(), key[1]
+        if encoding and len(body) >= MIN_COMPRESS:
+            body = compress(body, encoding)
+        else:
+            encoding = None
+        cached = (body, encoding)
+        body_cache.put(key, cached)
+    body, encoding = cached
+    response.status_code = 200
+    response.set_data(body)
+    if encoding:
+        response.content_encoding = encoding
+    return response
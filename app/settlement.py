@@ -0,0 +1,235 @@
+import logging
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+
+from ingest.ohlc_cache import OhlcCache, MINUTE_MS
+
+from .models import db, Prediction
+from .storage import add_points
+
+log = logging.getLogger(__name__)
+
+# Binance's maximum klines per request
+KLINE_LIMIT = 1000
+
+# Settle one row unless another runner already has; returns what it paid
+_predictions = Prediction.__table__
+CLAIM = (
+    db.update(_predictions)
+    .where(_predictions.c.id == db.bindparam('row_id'), _predictions.c.settled_at.is_(None))
+    .values(
+        actual_price=db.bindparam('actual'),
+        points_earned=db.bindparam('points'),
+        settled_at=db.bindparam('now')
+    )
+    .returning(_predictions.c.user_id, _predictions.c.points_earned)
+)
+# Give up on a row that can never be priced: settled, no actual_price, 0 points
+VOID = (
+    db.update(_predictions)
+    .where(_predictions.c.id == db.bindparam('row_id'), _predictions.c.settled_at.is_(None))
+    .values(points_earned=0, settled_at=db.bindparam('now'))
+)
+
+
+def score(predicted, actual):
+    """Points for a guess: 100 for an exact price, minus 1 per % of error."""
+    accuracy = abs(predicted - actual) / actual
+    return int((1 - accuracy) * 100)
+
+
+def utc_naive(ts):
+    """Datetimes are stored as naive UTC."""
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(timezone.utc).replace(tzinfo=None)
+    return ts
+
+
+def _minute(ts):
+    return int(ts.replace(tzinfo=timezone.utc).timestamp() // 60 * MINUTE_MS)
+
+
+def _spans(minutes):
+    """Sorted minute open times -> [(start, end)] spans of at most KLINE_LIMIT minutes."""
+    spans = []
+    i = 0
+    while i < len(minutes):
+        start = minutes[i]
+        end = start + (KLINE_LIMIT - 1) * MINUTE_MS
+        while i < len(minutes) and minutes[i] <= end:
+            i += 1
+        spans.append((start, minutes[i - 1]))
+    return spans
+
+
+class Settlement:
+    """
+    Scores stored predictions once their prediction_time has passed.
+
+    Every SETTLEMENT_INTERVAL seconds the pending rows whose minute has
+    closed are grouped by (symbol, minute). Each group is priced once from
+    the local 1m OHLC cache; the minutes it lacks are filled with one
+    klines range request per symbol (per 1000 minutes). All the groups'
+    points_earned and the users' totals are then written in a single
+    transaction. Groups without a price stay pending for the next run,
+    unless they can never be priced: rows for symbols outside `symbols`
+    and groups Binance answered without their minute `max_misses` runs in
+    a row are voided (settled with no actual_price and 0 points), so they
+    stop holding back the oldest-first queue. Upstream errors never void.
+
+    `source(pair, start_ms, end_ms)` returns raw Binance 1m klines.
+    """
+
+    def __init__(self, source=None, interval=30.0, batch_size=5000, cache_path='ohlc_cache.sqlite',
+                 symbols=None, max_misses=3):
+        self.source = source
+        self.symbols = set(symbols) if symbols else None
+        self.max_misses = max_misses
+        self._misses = defaultdict(int)  # (pair, minute) -> runs answered without it
+        self.interval = interval
+        self.batch_size = batch_size
+        self.cache_path = cache_path
+        self.on_commit = None    # called with [(user_id, username, points)] after commit
+        self.app = None
+        self._cache = None
+        self._worker = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self.upstream_calls = 0
+
+    def init_app(self, app, source=None, on_commit=None):
+        self.app = app
+        self.source = source or self.source
+        self.on_commit = on_commit or self.on_commit
+        self.interval = app.config.get('SETTLEMENT_INTERVAL', self.interval)
+        self.cache_path = app.config.get('OHLC_CACHE_PATH', self.cache_path)
+        self.symbols = set(app.config.get('SUPPORTED_SYMBOLS', self.symbols or ())) or None
+        app.extensions['settlement'] = self
+
+    @property
+    def cache(self):
+        if self._cache is None:
+            self._cache = OhlcCache(self.cache_path, interval='1m')
+        return self._cache
+
+    def start(self):
+        """Run settle() every `interval` seconds on a daemon thread."""
+        with self._lock:
+            if self._worker is None and self.interval:
+                self._worker = threading.Thread(target=self._run, name='settlement', daemon=True)
+                self._worker.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.settle()
+            except Exception as e:
+                log.error(f"settlement run failed: {e}")
+
+    def settle(self, now=None):
+        """Settle (or void) the pending predictions whose minute has closed; returns how many."""
+        now = utc_naive(now or datetime.now(timezone.utc))
+        closed_before = datetime.fromtimestamp((_minute(now) / 1000), timezone.utc).replace(tzinfo=None)
+        with self.app.app_context():
+            pending = db.session.execute(
+                db.select(
+                    Prediction.id, Prediction.user_id, Prediction.crypto_symbol,
+                    Prediction.predicted_price, Prediction.prediction_time
+                )
+                .where(
+                    Prediction.settled_at.is_(None),
+                    Prediction.actual_price.is_(None),  # priced rows were scored on submit
+                    Prediction.prediction_time < closed_before
+                )
+                .order_by(Prediction.prediction_time)
+                .limit(self.batch_size)
+            ).all()
+            if not pending:
+                return 0
+
+            groups = defaultdict(list)
+            void = []
+            for row in pending:
+                if self.symbols is not None and row.crypto_symbol not in self.symbols:
+                    void.append(row.id)
+                else:
+                    groups[(f"{row.crypto_symbol}USDT", _minute(row.prediction_time))].append(row)
+            prices, unavailable = self.prices(list(groups))
+            for key in groups:
+                if key in prices:
+                    self._misses.pop(key, None)
+                elif key in unavailable:
+                    self._misses[key] += 1
+                    if self._misses[key] >= self.max_misses:
+                        del self._misses[key]
+                        void += [row.id for row in groups[key]]
+
+            # Each row is claimed with `settled_at IS NULL`, and only the rows
+            # this transaction actually changed are paid, so concurrent runners
+            # (one per worker process, or a manual settle()) never pay twice.
+            earned = defaultdict(int)
+            settled = 0
+            for key, rows in groups.items():
+                actual = prices.get(key)
+                if actual is None:
+                    continue
+                for row in rows:
+                    claimed = db.session.execute(CLAIM, {
+                        'row_id': row.id, 'actual': actual,
+                        'points': score(row.predicted_price, actual), 'now': now
+                    }).one_or_none()
+                    if claimed is not None:
+                        earned[claimed.user_id] += claimed.points_earned
+                        settled += 1
+            if void:
+                log.warning(f"voiding {len(void)} predictions that cannot be priced")
+                db.session.execute(VOID, [{'row_id': row_id, 'now': now} for row_id in void])
+            if not settled and not void:
+                db.session.rollback()
+                return 0
+
+            totals = add_points(earned)
+            db.session.commit()
+
+        if self.on_commit and totals:
+            self.on_commit(totals)
+        return settled + len(void)
+
+    def prices(self, keys):
+        """
+        ({(pair, minute_ms): close}, unavailable) for the requested minutes,
+        cache first. `unavailable` holds the keys of closed minutes that
+        upstream answered for without returning a kline.
+        """
+        by_pair = defaultdict(list)
+        for pair, minute in keys:
+            by_pair[pair].append(minute)
+
+        found = {}
+        answered = set()
+        for pair, minutes in by_pair.items():
+            minutes = sorted(set(minutes))
+            cached = self.cache.get_range(pair, minutes[0], minutes[-1])
+            missing = [m for m in minutes if m not in cached]
+            for start, end in _spans(missing):
+                self.upstream_calls += 1
+                try:
+                    klines = self.source(pair, start, end)
+                except Exception as e:
+                    log.warning(f"klines {pair} {start}-{end} failed: {e}")
+                    continue
+                now_ms = int(time.time() * 1000)
+                self.cache.put_klines(pair, [k for k in klines if int(k[6]) < now_ms])
+                answered.update((pair, m) for m in missing if start <= m <= end and m + MINUTE_MS <= now_ms)
+            if missing:
+                cached = self.cache.get_range(pair, minutes[0], minutes[-1])
+            found.update(((pair, m), cached[m]['close']) for m in minutes if m in cached)
+        return found, answered - set(found)
+
+
+settlement = Settlement()
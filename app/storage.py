@@ -0,0 +1,239 @@
+import atexit
+import logging
+import queue
+import threading
+import time
+from collections import defaultdict
+
+from sqlalchemy import event, inspect, make_url
+
+from .models import db, User, Prediction
+
+log = logging.getLogger(__name__)
+
+# ────────────────────────────────
+# SQLite profiles
+# ────────────────────────────────
+# 'legacy' keeps SQLite's defaults (rollback journal, writers fail fast
+# with "database is locked"); 'production' lets readers run alongside the
+# single writer and makes writers queue for the lock instead of erroring.
+PROFILES = {
+    'legacy': {
+        'pragmas': {},
+        'engine': {},
+    },
+    'production': {
+        'pragmas': {
+            'journal_mode': 'WAL',
+            'synchronous': 'NORMAL',     # fsync at checkpoints only; safe with WAL
+            'busy_timeout': 10000,       # ms to wait for the write lock
+            'foreign_keys': 'ON',
+            'temp_store': 'MEMORY',
+            'cache_size': -32000,        # KiB (32 MB) of page cache per connection
+        },
+        'engine': {
+            'pool_size': 10,
+            'max_overflow': 20,
+            'pool_timeout': 30,
+            'pool_recycle': 3600,
+            'connect_args': {'timeout': 10, 'check_same_thread': False},
+        },
+    },
+}
+
+
+def engine_options(profile, url):
+    """
+    SQLALCHEMY_ENGINE_OPTIONS for a profile (must be set before db.init_app).
+    The profiles are SQLite-specific: other databases get the defaults.
+    """
+    if make_url(url).get_backend_name() != 'sqlite':
+        return {}
+    return dict(PROFILES[profile]['engine'])
+
+
+def apply_pragmas(engine, profile):
+    """Run the profile's PRAGMAs on every new pooled connection (SQLite only)."""
+    pragmas = PROFILES[profile]['pragmas']
+    if not pragmas or engine.url.get_backend_name() != 'sqlite':
+        return
+
+    @event.listens_for(engine, 'connect')
+    def _set_pragmas(dbapi_conn, _):
+        cursor = dbapi_conn.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name}={value}')
+        cursor.close()
+
+
+def migrate_sqlite():
+    """
+    Rebuild existing SQLite tables whose columns or NOT NULL constraints no
+    longer match the models, copying their rows (SQLite cannot add
+    constraints or change them in place). create_all() only handles new tables.
+    """
+    engine = db.engine
+    if engine.dialect.name != 'sqlite':
+        return
+    inspector = inspect(engine)
+    existing = set(inspector.get_table_names())
+    for table in db.metadata.sorted_tables:
+        if table.name not in existing:
+            continue
+        current = {c['name']: c for c in inspector.get_columns(table.name)}
+        if all(c.name in current and bool(current[c.name]['nullable']) == c.nullable for c in table.columns):
+            continue
+        common = ', '.join(c.name for c in table.columns if c.name in current)
+        old = f'_{table.name}_old'
+        log.warning(f"rebuilding table {table.name} to match the model")
+        with engine.connect() as conn:
+            conn.exec_driver_sql('PRAGMA foreign_keys=OFF')
+            for index in inspector.get_indexes(table.name):
+                conn.exec_driver_sql(f'DROP INDEX "{index["name"]}"')
+            conn.exec_driver_sql(f'ALTER TABLE "{table.name}" RENAME TO "{old}"')
+            table.create(conn)
+            conn.exec_driver_sql(f'INSERT INTO "{table.name}" ({common}) SELECT {common} FROM "{old}"')
+            if table.name == Prediction.__tablename__ and 'settled_at' not in current:
+                # rows scored before deferred settlement existed are already paid out
+                conn.exec_driver_sql(
+                    f'UPDATE "{table.name}" SET settled_at = COALESCE(created_at, prediction_time) '
+                    f'WHERE actual_price IS NOT NULL'
+                )
+            conn.exec_driver_sql(f'DROP TABLE "{old}"')
+            conn.commit()
+            conn.exec_driver_sql('PRAGMA foreign_keys=ON')
+
+
+def add_points(earned):
+    """
+    Add {user_id: points} to the users' totals, one UPDATE ... RETURNING
+    per user, in the current transaction. Returns [(user_id, username, total)].
+    """
+    totals = []
+    for user_id, points in earned.items():
+        totals += db.session.execute(
+            db.update(User)
+            .where(User.id == user_id)
+            .values(points=db.func.coalesce(User.points, 0) + points)
+            .returning(User.id, User.username, User.points)
+        ).all()
+    return totals
+
+
+# ────────────────────────────────
+# Write-behind for scored predictions
+# ────────────────────────────────
+class PredictionWriter:
+    """
+    Optional write-behind queue for /api/predict.
+
+    When enabled (PREDICTION_WRITE_BEHIND), requests enqueue their scored
+    prediction and return; a worker thread commits whatever has queued up
+    within PREDICTION_FLUSH_MS (at most PREDICTION_FLUSH_SIZE rows) in one
+    transaction: one executemany INSERT plus one points UPDATE per user.
+    Rows still queued at shutdown are flushed by an atexit hook; a crash
+    loses at most one flush window.
+    """
+
+    def __init__(self, enabled=False, flush_ms=50, flush_size=256, on_commit=None):
+        self.enabled = enabled
+        self.flush_interval = flush_ms / 1000
+        self.flush_size = flush_size
+        self.on_commit = on_commit    # called with [(user_id, username, points)] after commit
+        self.app = None
+        self._queue = queue.Queue()
+        self._worker = None
+        self._lock = threading.Lock()
+        self.commits = 0
+        self.rows = 0
+
+    def init_app(self, app, on_commit=None):
+        self.app = app
+        self.enabled = app.config.get('PREDICTION_WRITE_BEHIND', self.enabled)
+        self.flush_interval = app.config.get('PREDICTION_FLUSH_MS', self.flush_interval * 1000) / 1000
+        self.flush_size = app.config.get('PREDICTION_FLUSH_SIZE', self.flush_size)
+        self.on_commit = on_commit or self.on_commit
+        app.extensions['prediction_writer'] = self
+        if self.enabled:
+            atexit.register(self.flush)
+
+    def submit(self, row):
+        """Queue Prediction column values for the next group commit."""
+        self._ensure_worker()
+        self._queue.put(row)
+
+    def _ensure_worker(self):
+        if self._worker is None:
+            with self._lock:
+                if self._worker is None:
+                    self._worker = threading.Thread(target=self._run, name='prediction-writer', daemon=True)
+                    self._worker.start()
+
+    def _drain(self, first):
+        batch = [first]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.flush_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._drain(self._queue.get())
+            self._commit(batch)
+            for _ in batch:
+                self._queue.task_done()
+
+    def flush(self):
+        """Commit everything queued so far, from the calling thread."""
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if batch:
+            self._commit(batch)
+            for _ in batch:
+                self._queue.task_done()
+        if self._worker is not None:
+            self._queue.join()  # the worker's in-flight batch
+        return len(batch)
+
+    def _commit(self, batch):
+        with self.app.app_context():
+            try:
+                totals = self._write(batch)
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                log.error(f"group commit of {len(batch)} predictions failed ({e}); retrying one by one")
+                totals = []
+                for row in batch:
+                    try:
+                        totals += self._write([row])
+                        db.session.commit()
+                    except Exception as e:
+                        db.session.rollback()
+                        log.error(f"dropped prediction {row}: {e}")
+        self.commits += 1
+        self.rows += len(batch)
+        if self.on_commit and totals:
+            self.on_commit(totals)
+
+    @staticmethod
+    def _write(batch):
+        db.session.execute(db.insert(Prediction), batch)
+        earned = defaultdict(int)
+        for row in batch:
+            if row.get('settled_at') is not None:  # unsettled rows are scored later
+                earned[row['user_id']] += row['points_earned']
+        return add_points(earned)
+
+
+prediction_writer = PredictionWriter()
@@ -1,26 +1,46 @@
 import os
-import pandas as pd
+import json
+import threading
 import numpy as np
-import torch
-import torch.nn as nn
 from datetime import datetime, timedelta
-from binance.client import Client
-from newsapi import NewsApiClient
 
-from LSTM_model import LSTMRegressor  # Import only the class, not the training logic
-
-# ────────────────────────────────
-# Load trained LSTM model
-# ────────────────────────────────
-model = LSTMRegressor(input_dim=9, hidden_dim=64)
-model.load_state_dict(torch.load('best_lstm_model.pt', map_location=torch.device('cpu')))
-model.eval()
+# torch, pandas, python-binance and newsapi are imported where they are
+# first needed, so workers that never forecast or call upstream boot
+# without them (benchmarks/cold_start.py --importtime shows the cost).
+from lstm.inference import get_model  # loads the trained LSTM lazily, on first prediction
+from lstm.features import compute_features
+from lstm.online import OnlineFeatures
+from lstm.batching import forecaster
+from .price_feed import price_feed
 
 # ────────────────────────────────
 # API Clients
 # ────────────────────────────────
-binance_client = Client(os.getenv('BINANCE_API_KEY'), os.getenv('bC2PE67Aowu2F6vqFnzi0sPvuh1sPEd9c0ZUUMbEe5ZDFbMhfTXrtUGD1Y7gSWrs'))
-newsapi = NewsApiClient(api_key=os.getenv('NEWSAPI_KEY'))
+_clients = {}
+_clients_lock = threading.Lock()
+
+def _client(name, factory):
+    client = _clients.get(name)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(name)
+            if client is None:
+                client = _clients[name] = factory()
+    return client
+
+def get_binance_client():
+    """Process-wide python-binance Client, built on first use (its constructor pings Binance)."""
+    def build():
+        from binance.client import Client
+        return Client(os.getenv('BINANCE_API_KEY'), os.getenv('bC2PE67Aowu2F6vqFnzi0sPvuh1sPEd9c0ZUUMbEe5ZDFbMhfTXrtUGD1Y7gSWrs'))
+    return _client('binance', build)
+
+def get_newsapi_client():
+    """Process-wide NewsApiClient, built on first use."""
+    def build():
+        from newsapi import NewsApiClient
+        return NewsApiClient(api_key=os.getenv('NEWSAPI_KEY'))
+    return _client('newsapi', build)
 
 # ────────────────────────────────
 # Helper Functions
@@ -39,11 +59,9 @@ def preprocess_data(df):
     return df[features], df[target]
 
 def create_sequences(X, window=20):
-    sequences = []
-    for i in range(len(X) - window + 1):
-        seq = X.iloc[i:i+window].values
-        sequences.append(seq)
-    return torch.tensor(np.array(sequences), dtype=torch.float32)
+    from lstm.windows import sliding_windows, to_tensor
+
+    return to_tensor([sliding_windows(X.to_numpy(), window)])
 
 def get_macd(df, short=12, long=26, signal=9):
     if df.empty or 'close' not in df.columns:
@@ -65,19 +83,143 @@ def get_macd(df, short=12, long=26, signal=9):
     }
 
 
+class _MacdState:
+    def __init__(self, close, ema_short, ema_long, ema_signal, macd, signal, histogram):
+        self.close = close            # the close array the state was last built from
+        self.n = len(macd)
+        self.ema_short = ema_short    # last EMA values, enough to extend the series
+        self.ema_long = ema_long
+        self.ema_signal = ema_signal
+        self.macd = macd              # capacity-doubling buffers, valid up to n
+        self.signal = signal
+        self.histogram = histogram
+
+
+class MacdCache:
+    """
+    Per-coin MACD keyed by (coin, short, long, signal).
+
+    The chart series only ever grows by appending bars, so instead of
+    re-running three `ewm` passes per request the last EMA values are kept
+    and new bars are folded in with the EMA recurrence, O(1) each.
+    """
+
+    def __init__(self):
+        self._states = {}
+        self._lock = threading.Lock()
+
+    def get(self, coin, close, short=12, long=26, signal=9):
+        key = (coin, short, long, signal)
+        state = self._states.get(key)
+        if state is None or state.close is not close:
+            with self._lock:
+                state = self._states.get(key)
+                if state is None or state.close is not close:
+                    state = self._update(state, close, short, long, signal)
+                    self._states[key] = state
+        n = state.n
+        return {
+            'macd': state.macd[:n],
+            'signal': state.signal[:n],
+            'histogram': state.histogram[:n]
+        }
+
+    def _update(self, state, close, short, long, signal):
+        close = np.asarray(close, dtype=np.float64)
+        if (
+            state is None
+            or state.n == 0
+            or len(close) < state.n
+            or not np.array_equal(close[:state.n], state.close[:state.n], equal_nan=True)
+            # pandas decays the EMA weights across missing bars: leave any gap
+            # touching the new bars (or ending the old ones) to a full pass
+            or np.isnan(close[state.n - 1:]).any()
+        ):
+            return self._build(close, short, long, signal)
+
+        a_s, a_l, a_g = (2 / (span + 1) for span in (short, long, signal))
+        n, total = state.n, len(close)
+        if total > len(state.macd):
+            cap = max(total, 2 * len(state.macd))
+            for name in ('macd', 'signal', 'histogram'):
+                buf = np.empty(cap)
+                buf[:n] = getattr(state, name)[:n]
+                setattr(state, name, buf)
+
+        ema_s, ema_l, ema_g = state.ema_short, state.ema_long, state.ema_signal
+        for i in range(n, total):
+            x = close[i]
+            ema_s = a_s * x + (1 - a_s) * ema_s
+            ema_l = a_l * x + (1 - a_l) * ema_l
+            ema_g = a_g * (ema_s - ema_l) + (1 - a_g) * ema_g
+            state.macd[i] = ema_s - ema_l
+            state.signal[i] = ema_g
+            state.histogram[i] = state.macd[i] - ema_g
+
+        state.ema_short, state.ema_long, state.ema_signal = ema_s, ema_l, ema_g
+        state.close, state.n = close, total
+        return state
+
+    @staticmethod
+    def _build(close, short, long, signal):
+        import pandas as pd
+
+        series = pd.Series(close)
+        ema_short = series.ewm(span=short, adjust=False).mean()
+        ema_long = series.ewm(span=long, adjust=False).mean()
+        macd = ema_short - ema_long
+        sig = macd.ewm(span=signal, adjust=False).mean()
+        hist = macd - sig
+        return _MacdState(
+            close, _last(ema_short), _last(ema_long), _last(sig),
+            macd.fillna(0).to_numpy(),
+            sig.fillna(0).to_numpy(),
+            hist.fillna(0).to_numpy()
+        )
+
+
+def _last(series):
+    return float(series.iloc[-1]) if len(series) else 0.0
+
+
+macd_cache = MacdCache()
+
+
+def fetch_prices(symbols):
+    """Latest USDT prices for `symbols`, in one Binance round-trip."""
+    pairs = {f"{s}USDT": s for s in symbols}
+    if len(pairs) == 1:
+        tickers = [get_binance_client().get_symbol_ticker(symbol=next(iter(pairs)))]
+    else:
+        tickers = get_binance_client().get_symbol_ticker(symbols=json.dumps(sorted(pairs), separators=(',', ':')))
+    return {pairs[t['symbol']]: float(t['price']) for t in tickers if t['symbol'] in pairs}
+
+def fetch_minute_klines(pair, start_ms, end_ms):
+    """Raw 1m klines for `pair` with open times in [start_ms, end_ms] (at most 1000)."""
+    return get_binance_client().get_klines(
+        symbol=pair, interval='1m', startTime=start_ms, endTime=end_ms, limit=1000
+    )
+
 def get_current_price(symbol):
-    ticker = binance_client.get_symbol_ticker(symbol=f"{symbol}USDT")
-    return float(ticker['price'])
+    # served from the in-memory price feed; see app/price_feed.py
+    return price_feed.get(symbol)
 
-def fetch_news():
+def fetch_news(since=None):
+    """
+    Crypto headlines from NewsAPI, newest first: the last day, or only
+    articles published at or after the ISO timestamp `since`.
+    """
     end_date = datetime.now()
     start_date = end_date - timedelta(days=1)
-    articles = newsapi.get_everything(
+    window = {'from_param': since} if since else {
+        'from_param': start_date.strftime('%Y-%m-%d'),
+        'to': end_date.strftime('%Y-%m-%d')
+    }
+    articles = get_newsapi_client().get_everything(
         q='cryptocurrency OR bitcoin OR ethereum OR bnb OR xrp OR solana',
-        from_param=start_date.strftime('%Y-%m-%d'),
-        to=end_date.strftime('%Y-%m-%d'),
         language='en',
-        sort_by='publishedAt'
+        sort_by='publishedAt',
+        **window
     )
     return [{
         'title': article['title'],
@@ -99,15 +241,9 @@ def generate_features(df):
       - sin_hour, cos_hour
     and return the augmented DataFrame.
     """
-    # ensure datetime
-    df = df.copy()
-    df['timestamp'] = pd.to_datetime(df['timestamp'])
-    # sort by coin/time
-    df = df.sort_values(['coin','timestamp'])
-
-    # 1) 60-min forward return
-    df['future_close'] = df.groupby('coin')['close'].shift(-60)
-    df['pct_return_60m'] = df['future_close'] / df['close'] - 1
+    # 1) 60-min forward return, x-minute returns & rolling vol, cyclical time:
+    #    one sort by coin/time and flat per-coin kernels (see lstm/features.py)
+    df = compute_features(df, vol_col='volume', vol_min_periods=1)
 
     # 2) numeric sentiment (adjust to your schema!)
     # if your CSV has a column called 'sentiment' with values 'positive' etc:
@@ -117,21 +253,6 @@ def generate_features(df):
         'negative': -1
    })
 
-    # 3) x-minute returns & rolling vol
-    for n in (5, 15, 30):
-        df[f'ret_{n}m'] = df.groupby('coin')['close'].pct_change(n)
-        df[f'vol_{n}m'] = (
-            df.groupby('coin')['volume']
-              .rolling(window=n, min_periods=1)
-              .std()
-              .reset_index(level=0, drop=True)
-        )
-
-    # 4) cyclical time
-    df['hour'] = df['timestamp'].dt.hour
-    df['sin_hour'] = np.sin(2 * np.pi * df['hour'] / 24)
-    df['cos_hour'] = np.cos(2 * np.pi * df['hour'] / 24)
-
     return df
 
 def make_predictions(df):
@@ -151,8 +272,49 @@ def make_predictions(df):
         raise ValueError("Not enough data to form a sequence (requires at least 20 rows)")
 
     X_seq = create_sequences(X_df)
+    return _run_model(X_seq)
+
+def _run_model(X_seq):
+    import torch
 
-    with torch.no_grad():
-        predictions = model(X_seq).detach().numpy()
+    with torch.inference_mode():
+        predictions = get_model()(X_seq).numpy()
 
     return predictions.flatten().tolist()
+
+# ────────────────────────────────
+# Live inference
+# ────────────────────────────────
+# Same feature definitions the model was trained on (csv_preprocess.py:
+# close-price volatility over full windows), maintained bar by bar: feed new
+# bars with online_features.update(...).
+online_features = OnlineFeatures(vol_col='close')
+
+# Enough trailing bars to fill the 20-row window behind the 30m features
+SEED_BARS = 1024
+_seeded = {}
+
+def seed_online_features(coin, series, version):
+    """(Re)build a coin's online state from its scored series, once per store version."""
+    if _seeded.get(coin) == version:
+        return
+    tail = slice(-SEED_BARS, None)
+    online_features.seed(
+        coin,
+        series.timestamp[tail],
+        series.close[tail],
+        series.columns['volume'][tail],
+        series.columns['sentiment'][tail]
+    )
+    _seeded[coin] = version
+
+def predict_latest(coin):
+    """
+    Predicted 60-minute return from the coin's latest 20 complete feature
+    rows, or None while the online state is still warming up. Concurrent
+    callers share forward passes through the micro-batching forecaster.
+    """
+    window = online_features.window(coin)
+    if window is None:
+        return None
+    return forecaster.predict(window)
@@ -0,0 +1,110 @@
+"""
+Server-side cost and payload size of the /api/charts body as a coin's
+history grows: every row through the stdlib encoder vs binary-search
+slicing + LTTB to --max-points + one orjson pass. Then the size of each
+response format (rows, columnar, Arrow IPC), raw and gzip-compressed.
+
+    python benchmarks/charts.py --rows 10000 100000 1000000 --max-points 2000
+"""
+import argparse
+import gzip
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app.chart_store import _partition  # noqa: E402
+from app.downsample import lttb  # noqa: E402
+from app.serialize import dumps  # noqa: E402
+
+
+def synthetic(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 50000 * np.exp(np.cumsum(rng.normal(0, 5e-4, rows)))
+    return pd.DataFrame({
+        'timestamp': pd.date_range('2020-01-01', periods=rows, freq='min', tz='UTC'),
+        'coin': 'BTC',
+        'headline': rng.choice([f'Headline number {i} about the crypto market today' for i in range(50)], rows),
+        'price_usd': close,
+        'open': close, 'high': close * 1.001, 'low': close * 0.999, 'close': close,
+    })
+
+
+def macd_arrays(close):
+    s = pd.Series(close)
+    macd = s.ewm(span=12, adjust=False).mean() - s.ewm(span=26, adjust=False).mean()
+    signal = macd.ewm(span=9, adjust=False).mean()
+    return {'macd': macd.to_numpy(), 'signal': signal.to_numpy(), 'histogram': (macd - signal).to_numpy()}
+
+
+def full_payload(series, macd):
+    return json.dumps({
+        'historical_data': series.records(),
+        'macd': {k: v.tolist() for k, v in macd.items()},
+        'predictions': []
+    }).encode()
+
+
+def capped_payload(series, macd, max_points, start=None, end=None):
+    lo, hi = series.bounds(start, end)
+    index = np.arange(lo, hi)
+    if max_points and hi - lo > max_points:
+        index = lo + lttb(series.timestamp[lo:hi].view('i8'), series.close[lo:hi], max_points)
+    return dumps({
+        'historical_data': series.records(index=index),
+        'macd': {k: v[index] for k, v in macd.items()},
+        'predictions': []
+    })
+
+
+def timed(fn, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - start)
+    return out, best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--max-points', type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    for rows in args.rows:
+        series = _partition(synthetic(rows))['BTC']
+        macd = macd_arrays(series.close)
+        old, t_old = timed(lambda: full_payload(series, macd), repeat=1 if rows > 200_000 else 3)
+        new, t_new = timed(lambda: capped_payload(series, macd, args.max_points))
+        week = series.timestamp[-1] - np.timedelta64(7, 'D')
+        ranged, t_range = timed(lambda: capped_payload(series, macd, args.max_points, start=week))
+        print(f"{rows:>9,} rows  all rows: {t_old * 1e3:8.1f} ms {len(old) / 1e6:7.2f} MB"
+              f"   capped: {t_new * 1e3:6.1f} ms {len(new) / 1e6:5.2f} MB"
+              f"   last 7d capped: {t_range * 1e3:6.1f} ms {len(ranged) / 1e6:5.2f} MB")
+
+    print(f"formats at {args.max_points} points (50 distinct headlines); an unchanged reload is a bodiless 304")
+    format_sizes(series, macd, args.max_points)
+
+
+def format_sizes(series, macd, max_points):
+    index = lttb(series.timestamp.view('i8'), series.close, max_points)
+    picked = {k: v[index] for k, v in macd.items()}
+    bodies = {
+        'rows': dumps({'historical_data': series.records(index=index), 'macd': picked, 'predictions': []}),
+        'columnar': dumps({'historical_data': {'format': 'columnar', **series.columnar(index)},
+                           'macd': picked, 'predictions': []}),
+        'arrow': series.arrow(index, extra=picked),
+    }
+    for name, body in bodies.items():
+        print(f"  {name:9s} {len(body) / 1e3:8.1f} kB   gzip {len(gzip.compress(body, 6)) / 1e3:7.1f} kB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Measure worker cold start: wall time for a fresh interpreter to import and
+build the Flask app (or just load the model), median over several runs.
+
+    python benchmarks/cold_start.py --runs 5 --target app
+    python benchmarks/cold_start.py --target api --importtime 15 --budget 1.0
+
+--importtime runs the snippet once more under `python -X importtime` and
+lists the slowest top-level packages (self time summed over their
+submodules) and the heavy modules that ended up loaded. --budget exits
+non-zero when the median exceeds it.
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TARGETS = {
+    # what a gunicorn/flask worker does before it can serve its first request
+    "app": "from app import create_app; create_app()",
+    # ... plus serving a non-ML route (no torch, pandas or upstream clients)
+    "api": ("from app import create_app; "
+            "assert create_app().test_client().get('/api/leaderboard').status_code == 200"),
+    # model import plus the first (lazy) weight load
+    "model": "from lstm.inference import get_model; get_model()",
+}
+
+# Modules a non-ML worker should not need at boot
+HEAVY = ("torch", "pandas", "pyarrow", "sklearn", "binance", "newsapi")
+
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def measure(snippet, runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", snippet], cwd=ROOT, check=True,
+                       stdout=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def import_profile(snippet):
+    """{top-level package: summed self time in s} from one -X importtime run."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", snippet], cwd=ROOT,
+                          check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    packages = defaultdict(float)
+    for line in proc.stderr.splitlines():
+        m = IMPORT_LINE.match(line)
+        if m:
+            packages[m.group(4).split(".")[0]] += int(m.group(1)) / 1e6
+    return packages
+
+
+def report_imports(snippet, top):
+    packages = import_profile(snippet)
+    total = sum(packages.values())
+    print(f"  imports: {total:.3f}s self time over {len(packages)} top-level packages")
+    for name, seconds in sorted(packages.items(), key=lambda kv: -kv[1])[:top]:
+        print(f"    {name:<24} {seconds:7.3f}s  {100 * seconds / total:5.1f}%")
+    loaded = [name for name in HEAVY if name in packages]
+    print(f"  heavy modules loaded: {', '.join(loaded) or 'none'}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--target", choices=sorted(TARGETS), default="app")
+    parser.add_argument("--snippet", help="custom code to time instead of --target")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--importtime", type=int, default=0, metavar="N",
+                        help="also list the N slowest packages to import")
+    parser.add_argument("--budget", type=float, help="fail if the median exceeds this (s)")
+    args = parser.parse_args(argv)
+
+    snippet = args.snippet or TARGETS[args.target]
+    times = measure(snippet, args.runs)
+    print(f"{snippet}")
+    print(f"  runs={len(times)}  median={statistics.median(times):.3f}s  "
+          f"min={min(times):.3f}s  max={max(times):.3f}s")
+    if args.importtime:
+        report_imports(snippet, args.importtime)
+    if args.budget is not None and statistics.median(times) > args.budget:
+        sys.exit(f"median cold start exceeds the {args.budget:.2f}s budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Time the grouped pandas feature code against the single-pass kernel on a
+synthetic minute-bar frame and check that both agree.
+
+    python benchmarks/features.py --rows 10000000 --coins 5
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from lstm.features import compute_features  # noqa: E402
+
+COLUMNS = ['future_close', 'pct_return_60m',
+           'ret_5m', 'ret_15m', 'ret_30m', 'vol_5m', 'vol_15m', 'vol_30m']
+
+
+def legacy_features(df):
+    """The per-column groupby code csv_preprocess.py used to run."""
+    df = df.sort_values(["coin", "timestamp"])
+    df["future_close"] = df.groupby("coin")["close"].shift(-60)
+    df["pct_return_60m"] = df["future_close"] / df["close"] - 1
+    for n in (5, 15, 30):
+        df[f"ret_{n}m"] = df.groupby("coin")["close"].pct_change(n)
+        df[f"vol_{n}m"] = df.groupby("coin")["close"].rolling(n).std().reset_index(0, drop=True)
+    df["hour"] = df["timestamp"].dt.hour
+    df["sin_hour"] = np.sin(2*np.pi*df["hour"]/24)
+    df["cos_hour"] = np.cos(2*np.pi*df["hour"]/24)
+    return df
+
+
+def synthetic(rows, coins, seed=0):
+    rng = np.random.default_rng(seed)
+    names = [f"C{i}" for i in range(coins)]
+    coin = rng.choice(names, rows)
+    minute = rng.permutation(rows)  # unique, shuffled timestamps
+    close = 50000 * np.exp(np.cumsum(rng.normal(0, 5e-4, rows)))
+    return pd.DataFrame({
+        "timestamp": pd.Timestamp("2025-01-01", tz="UTC") + pd.to_timedelta(minute, unit="min"),
+        "coin": coin,
+        "close": close,
+    })
+
+
+def timed(fn, df):
+    start = time.perf_counter()
+    out = fn(df)
+    return out, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--coins", type=int, default=5)
+    parser.add_argument("--nan-rate", type=float, default=1e-3,
+                        help="share of closes blanked for the NaN parity check")
+    args = parser.parse_args(argv)
+
+    df = synthetic(args.rows, args.coins)
+    print(f"rows: {len(df):,}  coins: {args.coins}")
+
+    old, t_old = timed(legacy_features, df)
+    new, t_new = timed(compute_features, df)
+    print(f"grouped pandas : {t_old:7.2f}s")
+    print(f"single pass    : {t_new:7.2f}s  ({t_old / t_new:.1f}x)")
+
+    compare(old, new)
+
+    # a NaN close may only blank the windows that contain it, as in pandas
+    holed = df.copy()
+    holed.loc[np.random.default_rng(1).random(len(df)) < args.nan_rate, "close"] = np.nan
+    print(f"with {holed['close'].isna().sum():,} NaN closes")
+    compare(legacy_features(holed), compute_features(holed))
+
+
+def compare(old, new):
+    old = old.loc[new.index]
+    for col in COLUMNS:
+        a, b = old[col].to_numpy(), new[col].to_numpy()
+        assert (np.isnan(a) == np.isnan(b)).all(), col
+        ok = ~np.isnan(a)
+        err = np.max(np.abs(a[ok] - b[ok]) / np.maximum(np.abs(a[ok]), 1e-12)) if ok.any() else 0.0
+        print(f"  {col:15s} max rel diff {err:.2e}  ({(~ok).sum():,} NaN)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Throughput and latency of LSTM forecasts under concurrent callers, with
+the micro-batching scheduler and with one forward pass per request.
+
+    python benchmarks/forecast.py --clients 64 --requests 50 --max-batch 32 --max-wait-ms 2
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+import torch
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from lstm.batching import Forecaster, forward  # noqa: E402
+from lstm.inference import get_model  # noqa: E402
+from lstm.model import FEATURES, SEQUENCE_LENGTH  # noqa: E402
+
+
+def run(forecaster, clients, requests, windows):
+    latencies = [[] for _ in range(clients)]
+    barrier = threading.Barrier(clients + 1)
+
+    def client(i):
+        barrier.wait()
+        for j in range(requests):
+            start = time.perf_counter()
+            forecaster.predict(windows[(i * requests + j) % len(windows)])
+            latencies[i].append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    for t in threads:
+        t.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    lat = np.concatenate([np.array(l) for l in latencies]) * 1e3
+    return clients * requests / elapsed, np.percentile(lat, 50), np.percentile(lat, 99)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--clients', type=int, default=64)
+    parser.add_argument('--requests', type=int, default=50)
+    parser.add_argument('--max-batch', type=int, default=32)
+    parser.add_argument('--max-wait-ms', type=float, default=2.0)
+    parser.add_argument('--threads', type=int, default=None, help='torch intra-op threads')
+    args = parser.parse_args(argv)
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+    get_model()  # load outside the timed region
+    rng = np.random.default_rng(0)
+    windows = rng.normal(size=(256, SEQUENCE_LENGTH, len(FEATURES))).astype(np.float32)
+
+    # batched and unbatched answers must agree
+    batched = Forecaster(args.max_batch, args.max_wait_ms)
+    single = Forecaster(1)
+    expected = forward(windows[:8])
+    for w, e in zip(windows[:8], expected):
+        assert abs(batched.predict(w) - e) < 1e-5 and abs(single.predict(w) - e) < 1e-5
+
+    print(f"{args.clients} clients x {args.requests} requests, torch threads: {torch.get_num_threads()}")
+    for label, forecaster in (('unbatched', single), (f'batched (max {args.max_batch}, {args.max_wait_ms} ms)', batched)):
+        rps, p50, p99 = run(forecaster, args.clients, args.requests, windows)
+        print(f"{label:28s} {rps:9.0f} req/s   p50 {p50:7.2f} ms   p99 {p99:7.2f} ms")
+    b = batched.batcher
+    print(f"mean batch size: {b.items / max(b.batches, 1):.1f}")
+
+
+if __name__ == '__main__':
+    main()
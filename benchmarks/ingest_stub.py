@@ -0,0 +1,102 @@
+"""
+Run the async ingester against local stub NewsAPI / Coinlayer / Binance
+servers (with simulated latency and occasional 429s) and report wall time.
+
+    python benchmarks/ingest_stub.py --days 14 --articles 40 --latency 0.05
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+from aiohttp import web
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from ingest import Ingester, Upstream  # noqa: E402
+from ingest.ohlc_cache import OhlcCache  # noqa: E402
+
+TITLES = ["Bitcoin rallies", "Ethereum and Solana slip", "XRP ruling", "BNB burn", "Markets wait"]
+
+
+def make_stub(articles, latency, error_rate):
+    async def maybe_fail(request):
+        await asyncio.sleep(latency)
+        if random.random() < error_rate:
+            raise web.HTTPTooManyRequests(headers={'Retry-After': '0'})
+
+    async def news(request):
+        await maybe_fail(request)
+        day = request.query['from']
+        items = [{
+            'title': TITLES[i % len(TITLES)],
+            'description': '',
+            'source': {'name': 'Stub'},
+            'publishedAt': f"{day}T{i % 24:02d}:{i % 60:02d}:00Z",
+        } for i in range(articles)]
+        return web.json_response({'articles': items})
+
+    async def prices(request):
+        await maybe_fail(request)
+        return web.json_response({'success': True, 'rates': {
+            'BTC': 85000.0, 'ETH': 1600.0, 'BNB': 590.0, 'XRP': 2.1, 'SOL': 140.0}})
+
+    async def klines(request):
+        await maybe_fail(request)
+        start = int(request.query['startTime'])
+        limit = int(request.query.get('limit', 500))
+        end = int(request.query.get('endTime', start + limit * 3600_000))
+        rows = [[t, "1", "2", "0.5", "1.5", "10", t + 3599_999]
+                for t in range(start, min(end + 1, start + limit * 3600_000), 3600_000)]
+        return web.json_response(rows)
+
+    app = web.Application()
+    app.router.add_get('/news', news)
+    app.router.add_get('/api/v3/klines', klines)
+    app.router.add_get('/coinlayer/{date}', prices)
+    return app
+
+
+async def run(args):
+    runner = web.AppRunner(make_stub(args.articles, args.latency, args.error_rate))
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    base = f"http://127.0.0.1:{port}"
+
+    cache = OhlcCache(':memory:')
+    start = datetime(2025, 3, 20)
+    # second run shows the OHLC cache being reused: no kline calls at all
+    for label in ('cold cache', 'warm cache'):
+        upstreams = dict(
+            news=Upstream('newsapi', f"{base}/news", args.rate, args.rate, backoff=0.01),
+            coinlayer=Upstream('coinlayer', f"{base}/coinlayer", args.rate, args.rate, backoff=0.01),
+            binance=Upstream('binance', base, args.binance_rate, args.binance_rate, backoff=0.01),
+        )
+        t0 = time.perf_counter()
+        async with Ingester(**upstreams, ohlc_cache=cache) as ingester:
+            df = await ingester.build_dataset(start, start + timedelta(days=args.days - 1))
+        elapsed = time.perf_counter() - t0
+        calls = {name: u.calls for name, u in upstreams.items()}
+        print(f"{label}: rows={len(df):,}  wall={elapsed:.2f}s  upstream calls={calls}")
+    await runner.cleanup()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--days', type=int, default=14)
+    parser.add_argument('--articles', type=int, default=40, help='articles per day')
+    parser.add_argument('--latency', type=float, default=0.05, help='stub response latency (s)')
+    parser.add_argument('--error-rate', type=float, default=0.02, help='fraction of 429 answers')
+    parser.add_argument('--rate', type=float, default=20.0, help='news/price requests per second')
+    parser.add_argument('--binance-rate', type=float, default=50.0)
+    asyncio.run(run(parser.parse_args(argv)))
+
+
+if __name__ == '__main__':
+    main()
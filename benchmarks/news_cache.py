@@ -0,0 +1,103 @@
+"""
+Page loads of /api/news against a stub NewsAPI with a fixed latency:
+one upstream query per load vs the stale-while-revalidate NewsCache.
+
+    python benchmarks/news_cache.py --clients 32 --loads 20 --latency-ms 300 --ttl 0.5
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app.news_cache import NewsCache  # noqa: E402
+
+
+class StubNews:
+    """Serves a growing article list; one new article per `every` seconds."""
+
+    def __init__(self, latency, every=0.1, backlog=100):
+        self.latency = latency
+        self.every = every
+        self.start = time.monotonic()
+        self.backlog = backlog
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def _articles(self):
+        now = datetime.now(timezone.utc)
+        count = self.backlog + int((time.monotonic() - self.start) / self.every)
+        return [{
+            'title': f'headline {i}',
+            'description': '',
+            'url': f'https://news.example/{i}',
+            'publishedAt': (now - timedelta(minutes=count - i)).strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'source': 'stub'
+        } for i in reversed(range(count))]
+
+    def __call__(self, since=None):
+        with self._lock:
+            self.calls.append(since)
+        time.sleep(self.latency)
+        articles = self._articles()
+        return [a for a in articles if since is None or a['publishedAt'] >= since]
+
+
+def run(load, clients, loads, pause):
+    latencies = [[] for _ in range(clients)]
+
+    def client(i):
+        for _ in range(loads):
+            start = time.perf_counter()
+            load()
+            latencies[i].append(time.perf_counter() - start)
+            time.sleep(pause)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    lat = np.concatenate([np.array(l) for l in latencies]) * 1e3
+    return elapsed, np.percentile(lat, 50), np.percentile(lat, 99)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--clients', type=int, default=32)
+    parser.add_argument('--loads', type=int, default=20)
+    parser.add_argument('--latency-ms', type=float, default=300)
+    parser.add_argument('--pause-ms', type=float, default=50)
+    parser.add_argument('--ttl', type=float, default=0.5)
+    args = parser.parse_args(argv)
+    pause = args.pause_ms / 1000
+    print(f"{args.clients} clients x {args.loads} loads, upstream latency {args.latency_ms:.0f} ms, ttl {args.ttl}s")
+
+    stub = StubNews(args.latency_ms / 1000)
+    elapsed, p50, p99 = run(stub, args.clients, args.loads, pause)
+    print(f"direct      {elapsed:6.2f}s  p50 {p50:7.2f} ms  p99 {p99:7.2f} ms  upstream calls {len(stub.calls)}")
+
+    stub = StubNews(args.latency_ms / 1000)
+    cache = NewsCache(stub, ttl=args.ttl)
+    elapsed, p50, p99 = run(cache.get, args.clients, args.loads, pause)
+    incremental = sum(since is not None for since in stub.calls)
+    print(f"news cache  {elapsed:6.2f}s  p50 {p50:7.2f} ms  p99 {p99:7.2f} ms  upstream calls {len(stub.calls)} "
+          f"({incremental} incremental)")
+
+    feed = cache.get()
+    urls = [a['url'] for a in feed]
+    assert len(urls) == len(set(urls)), "duplicate articles"
+    assert [a['publishedAt'] for a in feed] == sorted((a['publishedAt'] for a in feed), reverse=True)
+    print(f"cached articles: {len(feed)} (unique by URL, newest first)")
+
+
+if __name__ == '__main__':
+    main()
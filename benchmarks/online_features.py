@@ -0,0 +1,84 @@
+"""
+Per-bar cost of the live feature path: recomputing generate_features over
+the whole history vs folding the bar into the online per-coin state.
+Also checks that both produce the same 20-step window.
+
+    python benchmarks/online_features.py --history 100000 --bars 200
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from lstm.features import compute_features  # noqa: E402
+from lstm.model import FEATURES, SEQUENCE_LENGTH  # noqa: E402
+from lstm.online import CoinState  # noqa: E402
+
+SENTIMENT = {'positive': 1, 'neutral': 0, 'negative': -1}
+
+
+def synthetic(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'timestamp': pd.date_range('2025-01-01', periods=rows, freq='min', tz='UTC'),
+        'coin': 'BTC',
+        'close': 50000 * np.exp(np.cumsum(rng.normal(0, 5e-4, rows))),
+        'volume': rng.gamma(2.0, 50.0, rows),
+        'sentiment': rng.choice(['positive', 'neutral', 'negative'], rows),
+    })
+
+
+def batch_window(df):
+    """What make_predictions sees today: features over the whole frame."""
+    df = compute_features(df, vol_col='volume', vol_min_periods=1)
+    df['sentiment_num'] = df['sentiment'].map(SENTIMENT)
+    rows = df[FEATURES].dropna().to_numpy(dtype=np.float32)
+    return rows[-SEQUENCE_LENGTH:]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--history', type=int, default=100_000)
+    parser.add_argument('--bars', type=int, default=200)
+    args = parser.parse_args(argv)
+
+    df = synthetic(args.history + args.bars)
+    history, live = df.iloc[:args.history], df.iloc[args.history:]
+
+    state = CoinState(vol_col='volume', vol_min_periods=1)
+    start = time.perf_counter()
+    for row in history[['timestamp', 'close', 'volume', 'sentiment']].itertuples(index=False):
+        state.update(*row)
+    t_seed = time.perf_counter() - start
+
+    # recompute path: every new bar re-runs the features on the full frame
+    start = time.perf_counter()
+    for i in range(1, args.bars + 1):
+        expected = batch_window(df.iloc[:args.history + i])
+    t_batch = (time.perf_counter() - start) / args.bars
+
+    # online path: one O(1) update per bar
+    bars = list(live[['timestamp', 'close', 'volume', 'sentiment']].itertuples(index=False))
+    start = time.perf_counter()
+    for row in bars:
+        state.update(*row)
+        window = state.window()
+    t_online = (time.perf_counter() - start) / args.bars
+
+    print(f"history: {args.history:,} bars  (seeding online state: {t_seed:.2f}s)")
+    print(f"recompute per bar : {t_batch * 1e3:9.3f} ms")
+    print(f"online per bar    : {t_online * 1e3:9.3f} ms  ({t_batch / t_online:,.0f}x)")
+
+    err = np.abs(window - expected) / np.maximum(np.abs(expected), 1e-6)
+    print(f"window max rel diff: {err.max():.2e}")
+    assert err.max() < 1e-4
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+Burst of concurrent price lookups for one symbol, against a stub upstream
+with a fixed round-trip time: one ticker call per lookup vs the PriceFeed
+(poller + coalesced misses).
+
+    python benchmarks/price_feed.py --clients 64 --lookups 20 --rtt-ms 50
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app.price_feed import PriceFeed  # noqa: E402
+
+
+class StubTicker:
+    def __init__(self, rtt):
+        self.rtt = rtt
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, symbols):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.rtt)
+        return {s: 50000.0 + time.monotonic() % 1 for s in symbols}
+
+
+def burst(lookup, clients, lookups):
+    latencies = [[] for _ in range(clients)]
+    barrier = threading.Barrier(clients + 1)
+
+    def client(i):
+        barrier.wait()
+        for _ in range(lookups):
+            start = time.perf_counter()
+            lookup('BTC')
+            latencies[i].append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    for t in threads:
+        t.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    lat = np.concatenate([np.array(l) for l in latencies]) * 1e3
+    return elapsed, np.percentile(lat, 50), np.percentile(lat, 99)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--clients', type=int, default=64)
+    parser.add_argument('--lookups', type=int, default=20)
+    parser.add_argument('--rtt-ms', type=float, default=50)
+    args = parser.parse_args(argv)
+    total = args.clients * args.lookups
+    print(f"{args.clients} clients x {args.lookups} lookups, upstream RTT {args.rtt_ms:.0f} ms")
+
+    stub = StubTicker(args.rtt_ms / 1000)
+    elapsed, p50, p99 = burst(lambda s: stub([s])[s], args.clients, args.lookups)
+    print(f"direct      {total / elapsed:8.0f} lookups/s  p50 {p50:7.2f} ms  p99 {p99:7.2f} ms  upstream calls {stub.calls}")
+
+    stub = StubTicker(args.rtt_ms / 1000)
+    feed = PriceFeed(stub, max_age=5.0, poll_interval=2.0)
+    elapsed, p50, p99 = burst(feed.get, args.clients, args.lookups)
+    feed.stop()
+    print(f"price feed  {total / elapsed:8.0f} lookups/s  p50 {p50:7.2f} ms  p99 {p99:7.2f} ms  upstream calls {stub.calls}")
+
+
+if __name__ == '__main__':
+    main()
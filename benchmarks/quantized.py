@@ -0,0 +1,71 @@
+"""
+CPU latency and throughput of the eager float32 LSTMRegressor against the
+exported TorchScript artifact (and a float32 TorchScript build, for
+reference), plus an output parity check.
+
+    python -m lstm.export
+    python benchmarks/quantized.py --batches 1 32 256 --iters 200
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import torch
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from lstm.export import compile_model, parity, quantize, sample_windows  # noqa: E402
+from lstm.inference import DEFAULT_ARTIFACT, DEFAULT_WEIGHTS, load_artifact, load_model  # noqa: E402
+
+
+def timed(model, X, iters):
+    with torch.inference_mode():
+        for _ in range(5):
+            model(X)
+        times = []
+        for _ in range(iters):
+            start = time.perf_counter()
+            model(X)
+            times.append(time.perf_counter() - start)
+    return np.array(times)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--weights', default=DEFAULT_WEIGHTS)
+    parser.add_argument('--artifact', default=DEFAULT_ARTIFACT)
+    parser.add_argument('--batches', type=int, nargs='+', default=[1, 32, 256])
+    parser.add_argument('--iters', type=int, default=200)
+    args = parser.parse_args(argv)
+
+    eager = load_model(args.weights)
+    if os.path.exists(args.artifact):
+        artifact = load_artifact(args.artifact)
+    else:
+        print(f"{args.artifact} not found, quantizing in memory")
+        artifact = compile_model(quantize(eager))
+
+    rel_diff, agree = parity(eager, artifact, sample_windows(model=eager))
+    print(f"parity: max |diff| {rel_diff:.2%} of max |pred|, sign agreement {agree:.2%}")
+    print(f"torch threads: {torch.get_num_threads()}")
+
+    models = {'eager': eager, 'script fp32': compile_model(eager), 'artifact': artifact}
+    X_all = sample_windows(max(args.batches), seed=1, model=eager)
+    for batch in args.batches:
+        X = X_all[:batch]
+        base = None
+        for name, model in models.items():
+            t = timed(model, X, args.iters)
+            base = base or t.mean()
+            print(
+                f"batch {batch:4d}  {name:12s} p50 {np.median(t) * 1e3:7.3f} ms"
+                f"  p99 {np.percentile(t, 99) * 1e3:7.3f} ms  {batch / t.mean():9.0f}/s"
+                f"  {base / t.mean():.2f}x"
+            )
+
+
+if __name__ == '__main__':
+    main()
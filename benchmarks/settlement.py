@@ -0,0 +1,122 @@
+"""
+Settle a backlog of stored quiz predictions against a stub klines upstream:
+one price lookup per prediction vs grouped (symbol, minute) settlement
+through the 1m OHLC cache.
+
+    python benchmarks/settlement.py --predictions 20000 --users 200 --minutes 600
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+SYMBOLS = ['BTC', 'ETH', 'BNB', 'SOL', 'XRP']
+START = datetime(2025, 1, 1)
+
+
+class StubKlines:
+    """Deterministic 1m klines; counts upstream calls."""
+
+    def __init__(self, rtt=0.05):
+        self.rtt = rtt
+        self.calls = 0
+
+    @staticmethod
+    def close(pair, minute_ms):
+        return 100.0 + SYMBOLS.index(pair[:-4]) * 10 + (minute_ms // 60000) % 97 / 10
+
+    def __call__(self, pair, start_ms, end_ms):
+        self.calls += 1
+        time.sleep(self.rtt)
+        return [
+            [t, 0, 0, 0, self.close(pair, t), 0, t + 59999]
+            for t in range(start_ms, end_ms + 1, 60000)
+        ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--predictions', type=int, default=20000)
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--minutes', type=int, default=600)
+    parser.add_argument('--rtt-ms', type=float, default=50)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ.update({
+            'DATABASE_URL': f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+            'OHLC_CACHE_PATH': os.path.join(tmp, 'ohlc.sqlite'),
+            'PREDICTION_SETTLEMENT': 'deferred',
+            'SETTLEMENT_INTERVAL': '0',
+        })
+        from app import create_app
+        from app.models import db, User, Prediction
+        from app.settlement import settlement, score
+
+        app = create_app()
+        stub = StubKlines(args.rtt_ms / 1000)
+        settlement.source = stub
+
+        rng = np.random.default_rng(0)
+        with app.app_context():
+            db.session.execute(db.insert(User), [
+                {'username': f'user{i}', 'password': 'pw', 'points': 0} for i in range(args.users)
+            ])
+            rows = []
+            for _ in range(args.predictions):
+                symbol = SYMBOLS[rng.integers(len(SYMBOLS))]
+                rows.append({
+                    'user_id': int(rng.integers(1, args.users + 1)),
+                    'crypto_symbol': symbol,
+                    'predicted_price': float(rng.uniform(90, 150)),
+                    'prediction_time': START + timedelta(seconds=int(rng.integers(args.minutes * 60))),
+                })
+            db.session.execute(db.insert(Prediction), rows)
+            db.session.commit()
+
+        groups = {(r['crypto_symbol'], r['prediction_time'].replace(second=0)) for r in rows}
+        print(f"{args.predictions:,} pending predictions, {len(groups):,} (symbol, minute) groups, "
+              f"upstream RTT {args.rtt_ms:.0f} ms")
+        print(f"per-prediction lookups : {args.predictions:6d} upstream calls  "
+              f"(~{args.predictions * args.rtt_ms / 1000:,.0f}s of round-trips)")
+
+        start = time.perf_counter()
+        settled = 0
+        while (n := settlement.settle()):  # batch_size rows per run
+            settled += n
+        elapsed = time.perf_counter() - start
+        print(f"grouped settlement     : {stub.calls:6d} upstream calls  {elapsed:6.2f}s  ({settled:,} settled)")
+
+        # everything again, now from the warm cache
+        with app.app_context():
+            db.session.execute(db.update(Prediction).values(settled_at=None, actual_price=None))
+            db.session.execute(db.update(User).values(points=0))
+            db.session.commit()
+        calls = stub.calls
+        start = time.perf_counter()
+        while settlement.settle():
+            pass
+        print(f"re-settle, warm cache  : {stub.calls - calls:6d} upstream calls  {time.perf_counter() - start:6.2f}s")
+
+        with app.app_context():
+            expected = {}
+            for p in db.session.query(Prediction):
+                minute_ms = int((p.prediction_time - datetime(1970, 1, 1)).total_seconds() // 60 * 60000)
+                actual = StubKlines.close(f'{p.crypto_symbol}USDT', minute_ms)
+                assert p.actual_price == actual and p.points_earned == score(p.predicted_price, actual)
+                expected[p.user_id] = expected.get(p.user_id, 0) + p.points_earned
+            for u in db.session.query(User):
+                assert u.points == expected.get(u.id, 0)
+            db.engine.dispose()
+        print("points_earned and user totals verified")
+
+
+if __name__ == '__main__':
+    main()
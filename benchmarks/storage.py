@@ -0,0 +1,100 @@
+"""
+Concurrent /api/predict traffic against a scratch SQLite database, for the
+'legacy' and 'production' storage profiles, with write-behind enabled and
+with deferred settlement (unscored inserts only).
+
+    python benchmarks/storage.py --clients 16 --requests 100 --users 50
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+CONFIGS = [
+    ('legacy', {'SQLITE_PROFILE': 'legacy', 'PREDICTION_WRITE_BEHIND': '0'}),
+    ('production', {'SQLITE_PROFILE': 'production', 'PREDICTION_WRITE_BEHIND': '0'}),
+    ('production + write-behind', {'SQLITE_PROFILE': 'production', 'PREDICTION_WRITE_BEHIND': '1'}),
+    ('production + deferred', {'SQLITE_PROFILE': 'production', 'PREDICTION_WRITE_BEHIND': '0',
+                               'PREDICTION_SETTLEMENT': 'deferred'}),
+]
+
+
+def make_app(tmp, env):
+    os.environ.update({'PREDICTION_SETTLEMENT': 'immediate', 'SETTLEMENT_INTERVAL': '0'})
+    os.environ.update(env)
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+    from app import create_app
+    from app.price_feed import price_feed
+
+    app = create_app()
+    price_feed.source = lambda symbols: {s: 100.0 for s in symbols}
+    return app
+
+
+def run(app, clients, requests, users):
+    client = app.test_client()
+    for i in range(users):
+        client.post('/api/register', json={'username': f'user{i}', 'password': 'pw'})
+
+    latencies = [[] for _ in range(clients)]
+    failures = [0] * clients
+    barrier = threading.Barrier(clients + 1)
+
+    def worker(i):
+        c = app.test_client()
+        rng = np.random.default_rng(i)
+        barrier.wait()
+        for _ in range(requests):
+            body = {
+                'user_id': int(rng.integers(1, users + 1)),
+                'crypto_symbol': 'BTC',
+                'predicted_price': float(rng.uniform(90, 110)),
+                'prediction_time': '2025-01-01T00:00:00',
+            }
+            start = time.perf_counter()
+            r = c.post('/api/predict', json=body)
+            latencies[i].append(time.perf_counter() - start)
+            failures[i] += r.status_code not in (201, 202)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(clients)]
+    for t in threads:
+        t.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    app.extensions['prediction_writer'].flush()
+    lat = np.concatenate([np.array(l) for l in latencies]) * 1e3
+    return clients * requests / elapsed, np.percentile(lat, 50), np.percentile(lat, 99), sum(failures)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=100)
+    parser.add_argument('--users', type=int, default=50)
+    args = parser.parse_args(argv)
+    print(f"{args.clients} clients x {args.requests} predictions, {args.users} users")
+
+    for label, env in CONFIGS:
+        with tempfile.TemporaryDirectory() as tmp:
+            app = make_app(tmp, env)
+            rps, p50, p99, failed = run(app, args.clients, args.requests, args.users)
+            from app.models import db, Prediction
+            with app.app_context():
+                stored = db.session.query(Prediction).count()
+                db.engine.dispose()
+        print(f"{label:26s} {rps:7.0f} req/s  p50 {p50:7.2f} ms  p99 {p99:8.2f} ms  "
+              f"failed {failed:4d}  stored {stored}")
+
+
+if __name__ == '__main__':
+    main()
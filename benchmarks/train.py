@@ -0,0 +1,65 @@
+"""
+Training throughput of the DataLoader loop (lstm.train.train) against the
+index-batched fast loop (train_fast) and its bf16 / torch.compile options,
+on random windows shaped like the real ones.
+
+    python benchmarks/train.py --windows 200000 --epochs 2 --threads 8
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+import torch
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from lstm.model import LSTMRegressor, FEATURES, SEQUENCE_LENGTH  # noqa: E402
+from lstm.train import train, train_fast  # noqa: E402
+
+
+def run(fn, X, y, epochs, **options):
+    torch.manual_seed(0)
+    model = LSTMRegressor(input_dim=len(FEATURES), hidden_dim=64)
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        fn(model, X, y, os.path.join(tmp, "model.pt"), epochs=epochs, patience=epochs, **options)
+        elapsed = time.perf_counter() - start
+    return int(0.9 * len(X)) * epochs / elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--windows", type=int, default=200_000)
+    parser.add_argument("--epochs", type=int, default=2)
+    parser.add_argument("--threads", type=int, default=torch.get_num_threads())
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[512, 2048])
+    parser.add_argument("--compile", action="store_true", help="also time torch.compile")
+    args = parser.parse_args(argv)
+
+    torch.set_num_threads(args.threads)
+    g = torch.Generator().manual_seed(0)
+    X = torch.randn(args.windows, SEQUENCE_LENGTH, len(FEATURES), generator=g)
+    y = torch.randn(args.windows, 1, generator=g) * 0.01
+    print(f"windows: {args.windows:,}  epochs: {args.epochs}  threads: {args.threads}")
+
+    configs = [("DataLoader  batch 32", train, {"batch_size": 32})]
+    for bs in args.batch_sizes:
+        configs.append((f"fast        batch {bs}", train_fast, {"batch_size": bs}))
+        configs.append((f"fast bf16   batch {bs}", train_fast, {"batch_size": bs, "bf16": True}))
+        if args.compile:
+            configs.append((f"fast compile batch {bs}", train_fast, {"batch_size": bs, "compile": True}))
+
+    base = None
+    for name, fn, options in configs:
+        rate = run(fn, X, y, args.epochs, **options)
+        base = base or rate
+        print(f"{name:<24} {rate:>10,.0f} samples/s  {rate / base:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,13 +6,11 @@ from sklearn.ensemble import GradientBoostingRegressor
 from sklearn.metrics import mean_squared_error
 import joblib
 import pathlib
+from dataset import read_table
 
 # ────────────────────────────────────────────────────────────────
 # 1. Load preprocessed feature CSV (with sentiment + features)
 # ────────────────────────────────────────────────────────────────
-df = pd.read_csv("crypto_news_features.csv", parse_dates=["timestamp"])
-df = df.sort_values(["coin", "timestamp"]).reset_index(drop=True)
-
 # Feature & target column names
 features = [
     "sentiment_num",
@@ -22,6 +20,10 @@ features = [
 ]
 target = "pct_return_60m"
 
+# only the columns the model needs are decoded
+df = read_table("crypto_news_features.parquet", columns=["coin", "timestamp"] + features + [target])
+df = df.sort_values(["coin", "timestamp"]).reset_index(drop=True)
+
 # ────────────────────────────────────────────────────────────────
 # 2. Chronological train/test split (80/20)
 # ────────────────────────────────────────────────────────────────
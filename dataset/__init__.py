@@ -0,0 +1,2 @@
+from .io import read_table, write_table, iter_batches, resolve, to_arrow, TableWriter
+from .schema import SCHEMAS
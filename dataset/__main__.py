@@ -0,0 +1,25 @@
+"""
+Convert a pipeline CSV to typed Parquet.
+
+    python -m dataset crypto_news_features.csv crypto_news_features.parquet --kind features
+"""
+import argparse
+
+from .io import read_table, write_table
+from .schema import SCHEMAS
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert a pipeline CSV to typed Parquet.")
+    parser.add_argument("src")
+    parser.add_argument("dst")
+    parser.add_argument("--kind", choices=sorted(SCHEMAS), required=True)
+    args = parser.parse_args(argv)
+
+    df = read_table(args.src)
+    write_table(df, args.dst, args.kind)
+    print(f"✅ {len(df):,} rows written to {args.dst}")
+
+
+if __name__ == "__main__":
+    main()
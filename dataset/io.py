@@ -0,0 +1,137 @@
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .schema import SCHEMAS
+
+# Rows per Parquet row group; with data sorted by (coin, timestamp) the
+# per-group min/max statistics let coin/time filters skip whole groups.
+ROW_GROUP_SIZE = 64 * 1024
+
+
+def resolve(path):
+    """
+    `path` if it exists, otherwise its .parquet/.csv sibling if that exists,
+    so stages can default to Parquet while the checked-in CSVs keep working.
+    """
+    if os.path.exists(path):
+        return path
+    stem, ext = os.path.splitext(path)
+    other = {'.csv': '.parquet', '.parquet': '.csv'}.get(ext)
+    if other and os.path.exists(stem + other):
+        return stem + other
+    return path
+
+
+def _utc(ts):
+    ts = pd.Timestamp(ts)
+    return ts.tz_localize('UTC') if ts.tz is None else ts.tz_convert('UTC')
+
+
+def _filters(coins, start, end):
+    filters = []
+    if coins is not None:
+        filters.append(('coin', 'in', list(coins)))
+    if start is not None:
+        filters.append(('timestamp', '>=', _utc(start)))
+    if end is not None:
+        filters.append(('timestamp', '<', _utc(end)))
+    return filters or None
+
+
+def to_arrow(df, kind):
+    """Cast a DataFrame to the fixed schema for `kind`; unknown columns keep inferred types."""
+    schema = SCHEMAS[kind]
+    df = df.copy()
+    if 'timestamp' in df.columns:
+        df['timestamp'] = pd.to_datetime(df['timestamp'], utc=True)
+    fields = []
+    for name in df.columns:
+        typ = schema.get(name)
+        if typ is None:
+            fields.append(pa.field(name, pa.Schema.from_pandas(df[[name]], preserve_index=False).types[0]))
+        else:
+            fields.append(pa.field(name, typ))
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    return table.cast(pa.schema(fields))
+
+
+def write_table(df, path, kind):
+    """Write `df` with the `kind` schema; `.csv` paths are still written as CSV."""
+    if path.endswith('.csv'):
+        df.to_csv(path, index=False)
+        return
+    sort = [c for c in ('coin', 'timestamp') if c in df.columns]
+    if sort:
+        df = df.sort_values(sort, kind='stable')
+    pq.write_table(to_arrow(df, kind), path, row_group_size=ROW_GROUP_SIZE)
+
+
+def read_table(path, columns=None, coins=None, start=None, end=None):
+    """
+    Load a pipeline table as a DataFrame.
+
+    For Parquet, `columns` is pushed down as a projection and `coins` /
+    `start` / `end` (end exclusive) as row-group filters, so only the needed
+    bytes are decoded. CSV files are read and filtered the slow way, for
+    compatibility with the checked-in datasets.
+    """
+    path = resolve(path)
+    if path.endswith('.parquet'):
+        table = pq.read_table(path, columns=columns, filters=_filters(coins, start, end))
+        return table.to_pandas()
+
+    df = pd.read_csv(path)
+    if 'timestamp' in df.columns:
+        df['timestamp'] = pd.to_datetime(df['timestamp'], utc=True)
+    if coins is not None:
+        df = df[df['coin'].isin(list(coins))]
+    if start is not None:
+        df = df[df['timestamp'] >= _utc(start)]
+    if end is not None:
+        df = df[df['timestamp'] < _utc(end)]
+    if columns is not None:
+        df = df[columns]
+    return df.reset_index(drop=True)
+
+
+def iter_batches(path, batch_size=10000, columns=None):
+    """Yield DataFrames of at most `batch_size` rows without loading the whole file."""
+    path = resolve(path)
+    if path.endswith('.parquet'):
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_size, columns=columns):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=batch_size, usecols=columns)
+
+
+class TableWriter:
+    """Append DataFrame chunks to a Parquet (or CSV) file with the `kind` schema."""
+
+    def __init__(self, path, kind):
+        self.path = path
+        self.kind = kind
+        self._writer = None
+        self._first = True
+
+    def write(self, df):
+        if self.path.endswith('.csv'):
+            df.to_csv(self.path, mode='w' if self._first else 'a', header=self._first, index=False)
+        else:
+            table = to_arrow(df, self.kind)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            self._writer.write_table(table.cast(self._writer.schema), row_group_size=ROW_GROUP_SIZE)
+        self._first = False
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,44 @@
+import pyarrow as pa
+
+# ────────────────────────────────────────────────────────────────
+# Fixed column types for the three pipeline stages
+# ────────────────────────────────────────────────────────────────
+TIMESTAMP = pa.timestamp('ns', tz='UTC')
+CATEGORY = pa.dictionary(pa.int8(), pa.string())
+
+OHLC = {
+    'timestamp': TIMESTAMP,
+    'coin': CATEGORY,
+    'headline': pa.string(),
+    'description': pa.string(),
+    'source': pa.string(),
+    'price_usd': pa.float64(),
+    'open': pa.float64(),
+    'high': pa.float64(),
+    'low': pa.float64(),
+    'close': pa.float64(),
+}
+
+SENTIMENT = {
+    **OHLC,
+    'sentiment_label': CATEGORY,
+    'sentiment_score': pa.float32(),
+}
+
+FEATURES = {
+    **SENTIMENT,
+    'future_close': pa.float64(),
+    'pct_return_60m': pa.float32(),
+    'sentiment_num': pa.float32(),
+    'ret_5m': pa.float32(),
+    'vol_5m': pa.float32(),
+    'ret_15m': pa.float32(),
+    'vol_15m': pa.float32(),
+    'ret_30m': pa.float32(),
+    'vol_30m': pa.float32(),
+    'hour': pa.int8(),
+    'sin_hour': pa.float32(),
+    'cos_hour': pa.float32(),
+}
+
+SCHEMAS = {'ohlc': OHLC, 'sentiment': SENTIMENT, 'features': FEATURES}
@@ -0,0 +1,22 @@
+import importlib
+
+# Re-exports resolved on first access, so importing a light submodule such
+# as ingest.ohlc_cache (the web app does) does not load pandas/pyarrow.
+_EXPORTS = {
+    'Ingester': '.pipeline',
+    'build_dataset': '.pipeline',
+    'build_dataset_async': '.pipeline',
+    'build_partitions': '.pipeline',
+    'PartitionStore': '.partitions',
+    'TokenBucket': '.ratelimit',
+    'Upstream': '.upstream',
+    'UpstreamError': '.upstream',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
@@ -0,0 +1,44 @@
+import os
+
+# --- CONFIG ---
+NEWSAPI_KEY = os.getenv('NEWSAPI_KEY', '78a444efa04c4a5cb28e653b6c57f67b')
+COINLAYER_API_KEY = os.getenv('COINLAYER_API_KEY', '0b55e8699e1af819a9db81647a605ab8')
+BINANCE_API_KEY = os.getenv('BINANCE_API_KEY', 'bC2PE67Aowu2F6vqFnzi0sPvuh1sPEd9c0ZUUMbEe5ZDFbMhfTXrtUGD1Y7gSWrs')
+CRYPTO_SYMBOLS = ['BTC', 'ETH', 'BNB', 'XRP', 'SOL']
+TARGET_CURRENCY = 'USD'
+
+CRYPTO_PAIRS = {
+    'BTC': 'BTCUSDT',
+    'ETH': 'ETHUSDT',
+    'BNB': 'BNBUSDT',
+    'XRP': 'XRPUSDT',
+    'SOL': 'SOLUSDT'
+}
+
+COIN_KEYWORDS = {
+    'BTC': ['bitcoin', 'btc'],
+    'ETH': ['ethereum', 'eth'],
+    'BNB': ['binance coin', 'bnb'],
+    'XRP': ['ripple', 'xrp'],
+    'SOL': ['solana', 'sol']
+}
+
+# --- UPSTREAMS ---
+# Base URLs are overridable so the ingester can run against local stub servers
+NEWSAPI_URL = os.getenv('NEWSAPI_URL', 'https://newsapi.org/v2/everything')
+COINLAYER_URL = os.getenv('COINLAYER_URL', 'https://api.coinlayer.com')
+BINANCE_URL = os.getenv('BINANCE_URL', 'https://api.binance.com')
+
+# Sustained requests/second and burst size per upstream
+NEWSAPI_RATE, NEWSAPI_BURST = 2.0, 2
+COINLAYER_RATE, COINLAYER_BURST = 2.0, 2
+BINANCE_RATE, BINANCE_BURST = 10.0, 10
+
+
+def detect_coins_from_title(title):
+    title = title.lower()
+    matched_coins = []
+    for symbol, keywords in COIN_KEYWORDS.items():
+        if any(keyword in title for keyword in keywords):
+            matched_coins.append(symbol)
+    return matched_coins
@@ -0,0 +1,67 @@
+import sqlite3
+import threading
+
+HOUR_MS = 3600 * 1000
+MINUTE_MS = 60 * 1000
+
+
+def hour_bucket(timestamp):
+    """Open time (ms since epoch) of the 1h kline containing `timestamp`."""
+    return int(timestamp.timestamp() // 3600 * 3600 * 1000)
+
+
+def minute_bucket(timestamp):
+    """Open time (ms since epoch) of the 1m kline containing `timestamp`."""
+    return int(timestamp.timestamp() // 60 * 60 * 1000)
+
+
+class OhlcCache:
+    """
+    Local store of closed klines keyed by (pair, open time in ms).
+
+    Filled by range requests and reused by every later run, so upstream
+    calls scale with the hours covered rather than the articles seen.
+    Each `interval` gets its own table ('klines' for 1h, 'klines_1m', ...).
+    """
+
+    def __init__(self, path="ohlc_cache.sqlite", interval="1h"):
+        self.path = path
+        self.interval = interval
+        self.table = "klines" if interval == "1h" else f"klines_{interval}"
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.table} ("
+            " pair TEXT NOT NULL, open_time INTEGER NOT NULL,"
+            " open REAL, high REAL, low REAL, close REAL,"
+            " PRIMARY KEY (pair, open_time)"
+            ") WITHOUT ROWID"
+        )
+        self._conn.commit()
+
+    def get_range(self, pair, start_ms, end_ms):
+        """Return {open_time: ohlc dict} for cached klines in [start_ms, end_ms]."""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT open_time, open, high, low, close FROM {self.table}"
+                " WHERE pair = ? AND open_time BETWEEN ? AND ?",
+                (pair, start_ms, end_ms),
+            ).fetchall()
+        return {
+            t: {'open': o, 'high': h, 'low': l, 'close': c}
+            for t, o, h, l, c in rows
+        }
+
+    def put_klines(self, pair, klines):
+        """Store raw Binance kline rows ([open_time, open, high, low, close, ...])."""
+        with self._lock:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO {self.table} (pair, open_time, open, high, low, close)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                [(pair, int(k[0]), float(k[1]), float(k[2]), float(k[3]), float(k[4])) for k in klines],
+            )
+            self._conn.commit()
+
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,73 @@
+import json
+import os
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from dataset import read_table, write_table
+
+
+class PartitionStore:
+    """
+    Day-partitioned dataset on disk plus a manifest of completed days.
+
+    Each day lives in its own file, written atomically; a day is only added
+    to the manifest once its partition is safely on disk, so an interrupted
+    build resumes from the first unfinished day.
+    """
+
+    MANIFEST = 'manifest.json'
+
+    def __init__(self, root='data/partitions'):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self._manifest_path = os.path.join(root, self.MANIFEST)
+        self.manifest = self._read_manifest()
+
+    def _read_manifest(self):
+        if not os.path.exists(self._manifest_path):
+            return {'completed': {}}
+        with open(self._manifest_path) as f:
+            return json.load(f)
+
+    def _write_manifest(self):
+        tmp = self._manifest_path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp, self._manifest_path)
+
+    @staticmethod
+    def key(day):
+        return day.strftime('%Y-%m-%d')
+
+    def path_for(self, day):
+        return os.path.join(self.root, f"date={self.key(day)}.parquet")
+
+    def is_complete(self, day):
+        return self.key(day) in self.manifest['completed']
+
+    def pending(self, days):
+        return [d for d in days if not self.is_complete(d)]
+
+    def write(self, day, df, complete=True):
+        """Write one day's rows; record it in the manifest when `complete`."""
+        path = self.path_for(day)
+        tmp = path + '.tmp'
+        write_table(df, tmp, 'ohlc')
+        os.replace(tmp, path)
+        if complete:
+            self.manifest['completed'][self.key(day)] = {
+                'rows': len(df),
+                'written_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            }
+            self._write_manifest()
+
+    def load(self):
+        """All partitions (complete or not) as one DataFrame, in day order."""
+        files = sorted(
+            f for f in os.listdir(self.root)
+            if f.startswith('date=') and f.endswith('.parquet')
+        )
+        frames = [read_table(os.path.join(self.root, f)) for f in files]
+        frames = [f for f in frames if not f.empty]
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
@@ -0,0 +1,273 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+
+import aiohttp
+import pandas as pd
+
+from . import config
+from .config import detect_coins_from_title
+from .ohlc_cache import OhlcCache, HOUR_MS, hour_bucket
+from .upstream import Upstream, UpstreamError
+
+# Binance's maximum klines per request
+KLINE_LIMIT = 1000
+
+COLUMNS = [
+    'timestamp', 'coin', 'headline', 'description', 'source',
+    'price_usd', 'open', 'high', 'low', 'close'
+]
+
+
+class Ingester:
+    """
+    Async news + price ingester.
+
+    Days are fetched concurrently; the hourly OHLC bars the articles need
+    are then resolved from the local OhlcCache, with the gaps filled by
+    bulk kline range requests. All traffic goes through one pooled aiohttp
+    session; each upstream has its own token bucket, so concurrency is
+    bounded by the upstream limits rather than by fixed sleeps.
+    """
+
+    def __init__(self, news=None, coinlayer=None, binance=None, ohlc_cache=None,
+                 max_connections=20, timeout=30):
+        self.news = news or Upstream('newsapi', config.NEWSAPI_URL,
+                                     config.NEWSAPI_RATE, config.NEWSAPI_BURST)
+        self.coinlayer = coinlayer or Upstream('coinlayer', config.COINLAYER_URL,
+                                               config.COINLAYER_RATE, config.COINLAYER_BURST)
+        self.binance = binance or Upstream('binance', config.BINANCE_URL,
+                                           config.BINANCE_RATE, config.BINANCE_BURST)
+        self.ohlc_cache = ohlc_cache if ohlc_cache is not None else OhlcCache()
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.session = None
+
+    async def __aenter__(self):
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.max_connections),
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+        )
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.session.close()
+
+    async def fetch_news_by_date(self, date_str):
+        params = {
+            'q': 'cryptocurrency OR bitcoin OR ethereum OR bnb OR xrp OR solana',
+            'from': date_str,
+            'to': date_str,
+            'sortBy': 'publishedAt',
+            'language': 'en',
+            'pageSize': 100,
+            'apiKey': config.NEWSAPI_KEY
+        }
+        try:
+            status, data = await self.news.get_json(self.session, params=params)
+        except UpstreamError as e:
+            status, data = None, str(e)
+        if status == 200:
+            return data.get('articles', [])
+        print(f"News fetch error ({date_str}):", data)
+        return None
+
+    async def fetch_historical_price(self, date_str):
+        params = {
+            'access_key': config.COINLAYER_API_KEY,
+            'symbols': ','.join(config.CRYPTO_SYMBOLS),
+            'target': config.TARGET_CURRENCY
+        }
+        try:
+            _, data = await self.coinlayer.get_json(self.session, date_str, params)
+        except UpstreamError as e:
+            data = {'error': str(e)}
+        if isinstance(data, dict) and data.get('success'):
+            return data['rates']
+        print(f"Price fetch error ({date_str}):", data.get('error') if isinstance(data, dict) else data)
+        return None
+
+    async def fetch_klines(self, pair, start_ms, end_ms):
+        """
+        Fetch up to KLINE_LIMIT 1h klines in [start_ms, end_ms] and cache the
+        closed ones. Returns the closed hours of the span Binance answered
+        for (with a kline or confirmed without one), or None on failure.
+        """
+        params = {
+            'symbol': pair,
+            'interval': '1h',
+            'startTime': start_ms,
+            'endTime': end_ms,
+            'limit': KLINE_LIMIT
+        }
+        try:
+            status, data = await self.binance.get_json(self.session, 'api/v3/klines', params)
+        except UpstreamError as e:
+            status, data = None, str(e)
+        if status != 200:
+            print(f"Klines fetch error ({pair} {start_ms}-{end_ms}):", data)
+            return None
+        now_ms = int(time.time() * 1000)
+        closed = [k for k in data if int(k[6]) < now_ms]  # never cache a still-forming candle
+        self.ohlc_cache.put_klines(pair, closed)
+        return {(pair, h) for h in range(start_ms, end_ms + 1, HOUR_MS) if h + HOUR_MS <= now_ms}
+
+    async def prefetch_ohlc(self, buckets):
+        """
+        Make sure every (pair, hour) bucket is in the OHLC cache; returns
+        the buckets left unresolved (neither cached nor confirmed empty).
+
+        Missing hours are grouped per pair into spans of at most KLINE_LIMIT
+        hours and fetched with one range request per span.
+        """
+        requests = []
+        missing_buckets = set()
+        for pair, hours in _group_by_pair(buckets).items():
+            cached = self.ohlc_cache.get_range(pair, hours[0], hours[-1])
+            missing = [h for h in hours if h not in cached]
+            missing_buckets.update((pair, h) for h in missing)
+            i = 0
+            while i < len(missing):
+                start = missing[i]
+                end = start + (KLINE_LIMIT - 1) * HOUR_MS
+                while i < len(missing) and missing[i] <= end:
+                    i += 1
+                requests.append(self.fetch_klines(pair, start, missing[i - 1]))
+        answered = set()
+        for hours in await asyncio.gather(*requests):
+            answered |= hours or set()
+        return missing_buckets - answered
+
+    def lookup_ohlc(self, buckets):
+        found = {}
+        for pair, hours in _group_by_pair(buckets).items():
+            cached = self.ohlc_cache.get_range(pair, hours[0], hours[-1])
+            found.update(((pair, h), cached[h]) for h in hours if h in cached)
+        return found
+
+    async def fetch_day(self, day):
+        """(article, coin, price, bucket) jobs for `day`, or None if an upstream failed."""
+        date_str = day.strftime('%Y-%m-%d')
+        print(f"Processing {date_str}...")
+
+        news_items, prices = await asyncio.gather(
+            self.fetch_news_by_date(date_str),
+            self.fetch_historical_price(date_str),
+        )
+        if news_items is None or prices is None:
+            return None
+
+        jobs = []
+        for item in news_items:
+            published = item.get('publishedAt')
+            if not published:
+                continue
+            dt = datetime.strptime(published, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
+            for coin in detect_coins_from_title(item['title']):
+                if coin in prices and coin in config.CRYPTO_PAIRS:
+                    bucket = (config.CRYPTO_PAIRS[coin], hour_bucket(dt))
+                    jobs.append((item, coin, prices[coin], bucket))
+        return jobs
+
+    @staticmethod
+    def assemble(jobs, ohlc):
+        rows = []
+        for item, coin, price, bucket in jobs:
+            bar = ohlc.get(bucket)
+            if bar is None:
+                continue
+            rows.append({
+                'timestamp': item['publishedAt'],
+                'coin': coin,
+                'headline': item.get('title'),
+                'description': item.get('description', ''),
+                'source': (item.get('source') or {}).get('name', 'Unknown'),
+                'price_usd': price,
+                'open': bar['open'],
+                'high': bar['high'],
+                'low': bar['low'],
+                'close': bar['close']
+            })
+        return rows
+
+    async def build_days(self, days):
+        """
+        Return ({day: DataFrame}, partial) for the days whose upstream
+        fetches succeeded; `partial` holds the days some of whose hourly
+        bars could not be resolved, so their rows may be incomplete.
+        """
+        # 1) news + daily prices for every day, concurrently
+        per_day = dict(zip(days, await asyncio.gather(*(self.fetch_day(d) for d in days))))
+        per_day = {day: jobs for day, jobs in per_day.items() if jobs is not None}
+
+        # 2) one pass over the distinct (pair, hour) buckets of all those days
+        buckets = {bucket for jobs in per_day.values() for *_, bucket in jobs}
+        unresolved = await self.prefetch_ohlc(buckets)
+        ohlc = self.lookup_ohlc(buckets)
+        frames = {
+            day: pd.DataFrame(self.assemble(jobs, ohlc), columns=COLUMNS)
+            for day, jobs in per_day.items()
+        }
+        partial = {
+            day for day, jobs in per_day.items()
+            if any(bucket in unresolved for *_, bucket in jobs)
+        }
+        return frames, partial
+
+    async def build_dataset(self, start_date, end_date):
+        frames, _ = await self.build_days(_day_range(start_date, end_date))
+        frames = frames.values()
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=COLUMNS)
+
+    async def build_partitions(self, start_date, end_date, store, batch_days=7):
+        """
+        Build [start_date, end_date] into `store`, skipping days already in
+        its manifest. Days are processed `batch_days` at a time and each day
+        is checkpointed as soon as its batch finishes. Today (UTC) and days
+        with hourly bars that failed to fetch are written but left out of the
+        manifest, so the next run rebuilds them.
+        """
+        today = datetime.now(timezone.utc).date()
+        days = store.pending(_day_range(start_date, end_date))
+        print(f"{len(days)} day(s) to build")
+        for i in range(0, len(days), batch_days):
+            frames, partial = await self.build_days(days[i:i + batch_days])
+            for day, df in frames.items():
+                if day in partial:
+                    print(f"{day:%Y-%m-%d}: some hourly bars are missing; will retry next run")
+                store.write(day, df, complete=day.date() < today and day not in partial)
+        return store
+
+
+def _day_range(start_date, end_date):
+    days = []
+    day = start_date
+    while day <= end_date:
+        days.append(day)
+        day += timedelta(days=1)
+    return days
+
+
+def _group_by_pair(buckets):
+    by_pair = {}
+    for pair, hour in buckets:
+        by_pair.setdefault(pair, set()).add(hour)
+    return {pair: sorted(hours) for pair, hours in by_pair.items()}
+
+
+async def build_dataset_async(start_date, end_date, **kwargs):
+    async with Ingester(**kwargs) as ingester:
+        return await ingester.build_dataset(start_date, end_date)
+
+
+def build_dataset(start_date, end_date, **kwargs):
+    return asyncio.run(build_dataset_async(start_date, end_date, **kwargs))
+
+
+async def build_partitions_async(start_date, end_date, store, **kwargs):
+    async with Ingester(**kwargs) as ingester:
+        return await ingester.build_partitions(start_date, end_date, store)
+
+
+def build_partitions(start_date, end_date, store, **kwargs):
+    return asyncio.run(build_partitions_async(start_date, end_date, store, **kwargs))
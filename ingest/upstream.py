@@ -0,0 +1,52 @@
+import asyncio
+import random
+
+import aiohttp
+
+from .ratelimit import TokenBucket
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class UpstreamError(Exception):
+    pass
+
+
+class Upstream:
+    """
+    One rate-limited HTTP API sharing the ingester's pooled session.
+
+    `get_json` waits for a token, then retries connection errors, timeouts,
+    bodies that are not JSON (e.g. a proxy's HTML error page) and 429/5xx
+    answers with exponential backoff (honouring Retry-After). Other
+    statuses are returned to the caller together with the body; once the
+    retries are exhausted it raises UpstreamError.
+    """
+
+    def __init__(self, name, base_url, rate, burst=1, max_retries=4, backoff=0.5):
+        self.name = name
+        self.base_url = base_url.rstrip('/')
+        self.bucket = TokenBucket(rate, burst)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.calls = 0
+
+    async def get_json(self, session, path='', params=None):
+        url = f"{self.base_url}/{path.lstrip('/')}" if path else self.base_url
+        for attempt in range(self.max_retries + 1):
+            await self.bucket.acquire()
+            self.calls += 1
+            delay = self.backoff * 2 ** attempt * (1 + random.random() / 2)
+            try:
+                async with session.get(url, params=params) as response:
+                    if response.status in RETRY_STATUSES and attempt < self.max_retries:
+                        retry_after = response.headers.get('Retry-After')
+                        if retry_after and retry_after.isdigit():
+                            delay = max(delay, float(retry_after))
+                    else:
+                        return response.status, await response.json(content_type=None)
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:  # ValueError: bad JSON
+                if attempt == self.max_retries:
+                    raise UpstreamError(f"{self.name}: {e}") from e
+            await asyncio.sleep(delay)
+        raise UpstreamError(f"{self.name}: retries exhausted for {url}")
@@ -0,0 +1,9 @@
+from .schema import FEATURES, TARGET, SEQUENCE_LENGTH
+
+
+def __getattr__(name):
+    # the model class pulls in torch; only load it when it is asked for
+    if name == "LSTMRegressor":
+        from .model import LSTMRegressor
+        return LSTMRegressor
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,109 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+from .inference import get_model
+
+
+class MicroBatcher:
+    """
+    Collects single inputs from many threads and runs them as one batch.
+
+    The first queued item opens a batch; the worker then waits at most
+    `max_wait_ms` for more items (or until `max_batch_size` are queued),
+    stacks them along a new leading axis and calls `fn` once. `fn` must
+    return one row per item. The worker thread starts on first use.
+    """
+
+    def __init__(self, fn, max_batch_size=32, max_wait_ms=2.0):
+        self.fn = fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue = queue.Queue()
+        self._worker = None
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.items = 0
+
+    def submit(self, x):
+        """Queue one input; returns a Future for its output row."""
+        self._ensure_worker()
+        future = Future()
+        self._queue.put((x, future))
+        return future
+
+    def __call__(self, x, timeout=None):
+        return self.submit(x).result(timeout)
+
+    def _ensure_worker(self):
+        if self._worker is None:
+            with self._lock:
+                if self._worker is None:
+                    self._worker = threading.Thread(target=self._run, name='micro-batcher', daemon=True)
+                    self._worker.start()
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            inputs = [x for x, _ in batch]
+            futures = [f for _, f in batch]
+            try:
+                out = self.fn(np.stack(inputs))
+            except Exception as e:
+                for f in futures:
+                    f.set_exception(e)
+                continue
+            self.batches += 1
+            self.items += len(batch)
+            for f, row in zip(futures, out):
+                f.set_result(row)
+
+
+def forward(windows):
+    """One LSTMRegressor pass over a (batch, window, features) array."""
+    import torch
+
+    X = torch.from_numpy(np.ascontiguousarray(windows, dtype=np.float32))
+    with torch.inference_mode():
+        return get_model()(X).numpy()[:, 0]
+
+
+class Forecaster:
+    """
+    Flask extension around a MicroBatcher feeding the shared LSTM.
+
+    Configured by FORECAST_MAX_BATCH and FORECAST_MAX_WAIT_MS; a max batch
+    of 1 disables batching and runs every request on its own.
+    """
+
+    def __init__(self, max_batch_size=32, max_wait_ms=2.0, fn=forward):
+        self.fn = fn
+        self.batcher = MicroBatcher(fn, max_batch_size, max_wait_ms)
+
+    def init_app(self, app):
+        self.batcher.max_batch_size = app.config.get('FORECAST_MAX_BATCH', self.batcher.max_batch_size)
+        self.batcher.max_wait = app.config.get('FORECAST_MAX_WAIT_MS', self.batcher.max_wait * 1000) / 1000
+        app.extensions['forecaster'] = self
+
+    def predict(self, window, timeout=5.0):
+        """Predicted return for one (window, features) array."""
+        if self.batcher.max_batch_size <= 1:
+            return float(self.fn(window[None])[0])
+        return float(self.batcher(window, timeout))
+
+
+forecaster = Forecaster()
@@ -0,0 +1,134 @@
+"""
+Versioned model bundle: the LSTM weights together with everything needed
+to feed them -- per-feature mean/std, feature order, window length and
+layer sizes -- in one torch.save file.
+
+Upgrade weights saved before bundles existed by refitting their scaler on
+the same training split lstm.train used:
+
+    python -m lstm.bundle --weights best_lstm_model.pt --data crypto_news_features.csv
+"""
+import argparse
+
+import numpy as np
+
+from .schema import FEATURES, TARGET, SEQUENCE_LENGTH
+
+FORMAT = "lstm-bundle"
+VERSION = 1
+
+
+class FeatureScaler:
+    """
+    Per-feature standardization of (..., features) arrays, numpy only.
+
+    Equivalent to one StandardScaler per feature column, but fitted and
+    applied with single broadcast operations over the whole window tensor.
+    """
+
+    def __init__(self, mean, std):
+        self.mean = np.asarray(mean, dtype=np.float64)
+        self.std = np.asarray(std, dtype=np.float64)
+
+    @classmethod
+    def fit(cls, X):
+        """Mean/std of every feature over all windows and time steps of X."""
+        flat = np.asarray(X).reshape(-1, np.shape(X)[-1])
+        mean = flat.mean(axis=0)
+        std = flat.std(axis=0)
+        std[std == 0] = 1.0  # constant features are only centred, as sklearn does
+        return cls(mean, std)
+
+    def transform(self, X, dtype=np.float32):
+        """(X - mean) / std over the last axis: one pass out, one in place."""
+        out = np.subtract(X, self.mean.astype(dtype), dtype=dtype)
+        out /= self.std.astype(dtype)
+        return out
+
+
+class Bundle:
+    """
+    A trained LSTMRegressor's state_dict plus its input contract. `scaler`
+    is None only for bare state_dicts saved before bundles existed.
+    """
+
+    def __init__(self, state_dict, scaler=None, features=FEATURES,
+                 sequence_length=SEQUENCE_LENGTH, target=TARGET, version=VERSION):
+        self.state_dict = state_dict
+        self.scaler = scaler
+        self.features = list(features)
+        self.sequence_length = sequence_length
+        self.target = target
+        self.version = version
+        weights_ih = [k for k in state_dict if k.startswith("lstm.weight_ih_l")]
+        self.num_layers = len(weights_ih)
+        self.hidden_dim = state_dict["lstm.weight_hh_l0"].shape[1]
+
+    @classmethod
+    def from_model(cls, model, scaler=None, **contract):
+        return cls({k: v.detach().clone() for k, v in model.state_dict().items()}, scaler, **contract)
+
+    def save(self, path):
+        import torch
+
+        payload = {
+            "format": FORMAT,
+            "version": VERSION,
+            "state_dict": self.state_dict,
+            "features": self.features,
+            "sequence_length": self.sequence_length,
+            "target": self.target,
+        }
+        if self.scaler is not None:
+            payload["mean"] = torch.from_numpy(self.scaler.mean)
+            payload["std"] = torch.from_numpy(self.scaler.std)
+        torch.save(payload, path)
+
+    @classmethod
+    def load(cls, path):
+        """Read a bundle, or wrap a bare state_dict (no scaler) for older weights."""
+        import torch
+
+        obj = torch.load(path, map_location=torch.device("cpu"))
+        if obj.get("format") != FORMAT:
+            return cls(obj, version=0)
+        if obj["version"] > VERSION:
+            raise ValueError(f"{path}: bundle version {obj['version']} is newer than supported ({VERSION})")
+        scaler = None
+        if "mean" in obj:
+            scaler = FeatureScaler(obj["mean"].numpy(), obj["std"].numpy())
+        return cls(obj["state_dict"], scaler, obj["features"], obj["sequence_length"],
+                   obj["target"], obj["version"])
+
+    def build(self):
+        """Eval-mode model; with a scaler it standardizes its raw-feature input."""
+        from .model import LSTMRegressor, Standardized
+
+        model = LSTMRegressor(len(self.features), self.hidden_dim, self.num_layers)
+        model.load_state_dict(self.state_dict)
+        if self.scaler is not None:
+            model = Standardized(model, self.scaler.mean, self.scaler.std)
+        return model.eval()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bundle bare LSTM weights with their feature scaler.")
+    parser.add_argument("--weights", default="best_lstm_model.pt")
+    parser.add_argument("--data", default="crypto_news_features.parquet")
+    parser.add_argument("--out", required=True, help="where to write the bundle (may equal --weights)")
+    parser.add_argument("--sequence-length", type=int, default=SEQUENCE_LENGTH)
+    args = parser.parse_args(argv)
+
+    from .train import load_features, create_sequences, split_train_test
+
+    bundle = Bundle.load(args.weights)
+    X, y = create_sequences(load_features(args.data), TARGET, args.sequence_length)
+    (X_train, _), _ = split_train_test(X, y)
+    bundle.scaler = FeatureScaler.fit(X_train)
+    bundle.sequence_length = args.sequence_length
+    bundle.save(args.out)
+    print(f"saved {args.out} (bundle v{VERSION}, scaler fitted on {len(X_train)} windows)")
+
+
+if __name__ == "__main__":
+    main()
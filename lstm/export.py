@@ -0,0 +1,92 @@
+"""
+Export the trained LSTMRegressor as a TorchScript artifact with dynamic
+int8 quantization of the LSTM and Linear layers. A bundle's feature scaling
+is compiled into the artifact, so it takes raw features like the eager model.
+
+    python -m lstm.export --weights best_lstm_model.pt --out best_lstm_model.int8.pt
+
+--dtype float32 skips quantization and only compiles the model. The export
+fails if, on a random batch of windows, the artifact drifts from the eager
+float32 model by more than --rtol of its largest prediction or agrees with
+it on the sign of fewer than --min-agreement of them. The sha256 of the
+weights is stored in the artifact; serving ignores it once they change.
+"""
+import argparse
+import warnings
+
+import numpy as np
+import torch
+import torch.nn as nn
+
+from .inference import DEFAULT_WEIGHTS, DEFAULT_ARTIFACT, SOURCE_DIGEST, load_model, weights_digest
+from .model import FEATURES, SEQUENCE_LENGTH
+
+
+def quantize(model):
+    """Dynamic int8 copy of `model`: weights int8, activations quantized on the fly."""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        return torch.ao.quantization.quantize_dynamic(model, {nn.LSTM, nn.Linear}, dtype=torch.qint8)
+
+
+def compile_model(model):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", FutureWarning)
+        return torch.jit.freeze(torch.jit.script(model.eval()))
+
+
+def sample_windows(n=512, seed=0, model=None):
+    """
+    Random standard-normal windows; for a model that standardizes its input
+    (a bundle), drawn in raw-feature units so they land in the same range.
+    """
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, SEQUENCE_LENGTH, len(FEATURES)))
+    if hasattr(model, "mean"):
+        X = X * model.std.numpy() + model.mean.numpy()
+    return torch.from_numpy(X.astype(np.float32))
+
+
+def parity(reference, candidate, X):
+    """
+    Max absolute difference of two models on X relative to the reference's
+    largest |prediction| (predictions are ~1e-3, too small for an absolute
+    tolerance), and the share of predictions whose signs agree.
+    """
+    with torch.inference_mode():
+        a = reference(X).numpy().ravel()
+        b = candidate(X).numpy().ravel()
+    scale = max(float(np.abs(a).max()), np.finfo(np.float32).tiny)
+    return float(np.abs(a - b).max()) / scale, float((np.sign(a) == np.sign(b)).mean())
+
+
+def export(weights, out, rtol=0.1, min_agreement=0.95, dtype="int8"):
+    eager = load_model(weights)
+    artifact = compile_model(quantize(eager) if dtype == "int8" else eager)
+
+    rel_diff, agree = parity(eager, artifact, sample_windows(model=eager))
+    print(f"parity vs eager float32: max |diff| {rel_diff:.2%} of max |pred|, sign agreement {agree:.2%}")
+    if rel_diff > rtol or agree < min_agreement:
+        raise SystemExit(f"{dtype} model drifts by {rel_diff:.2%} (> {rtol:.0%}) or agrees on "
+                         f"{agree:.2%} of signs (< {min_agreement:.0%}); not exported")
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", FutureWarning)
+        torch.jit.save(artifact, out, _extra_files={SOURCE_DIGEST: weights_digest(weights)})
+    print(f"saved {out}")
+    return artifact
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export a quantized TorchScript LSTM.")
+    parser.add_argument("--weights", default=DEFAULT_WEIGHTS)
+    parser.add_argument("--out", default=DEFAULT_ARTIFACT)
+    parser.add_argument("--rtol", type=float, default=0.1, help="max |diff| as a share of the largest |prediction|")
+    parser.add_argument("--min-agreement", type=float, default=0.95, help="min share of predictions with the same sign")
+    parser.add_argument("--dtype", choices=["int8", "float32"], default="int8")
+    args = parser.parse_args(argv)
+    export(args.weights, args.out, args.rtol, args.min_agreement, args.dtype)
+
+
+if __name__ == "__main__":
+    main()
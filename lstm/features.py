@@ -0,0 +1,200 @@
+import numpy as np
+
+HORIZONS = (5, 15, 30)
+FORWARD = 60
+
+# Rolling sums are accumulated per block of this many rows, each block
+# centred on its own first value, which keeps the sum-of-squares kernel
+# numerically stable for price-sized inputs (a plain cumsum over millions
+# of ~1e4 values loses most of the precision a 5-minute window needs).
+BLOCK = 2048
+
+
+class Segments:
+    """
+    Row layout of a frame sorted by (coin, timestamp): for every row, the
+    first index of its coin segment and one past the last.
+    """
+
+    def __init__(self, codes):
+        n = len(codes)
+        bounds = np.flatnonzero(codes[1:] != codes[:-1]) + 1
+        starts = np.concatenate(([0], bounds))
+        stops = np.concatenate((bounds, [n]))
+        lengths = stops - starts
+        self.n = n
+        self.start = np.repeat(starts, lengths)
+        self.stop = np.repeat(stops, lengths)
+        self.pos = np.arange(n) - self.start
+
+        # fixed-size blocks that never straddle two coins
+        blocks_per_seg = -(-lengths // BLOCK)
+        base = np.concatenate(([0], np.cumsum(blocks_per_seg)[:-1]))
+        self.block = np.repeat(base, lengths) + self.pos // BLOCK
+        self.offset = self.pos % BLOCK
+        self.block_start = np.arange(n) - self.offset
+        self.n_blocks = int(blocks_per_seg.sum())
+
+
+def shift_forward(x, seg, k):
+    """x shifted k rows back within each coin (pandas `groupby.shift(-k)`)."""
+    idx = np.arange(seg.n) + k
+    out = np.full(seg.n, np.nan)
+    ok = idx < seg.stop
+    out[ok] = x[idx[ok]]
+    return out
+
+
+def pct_change(x, seg, n):
+    """x[i] / x[i - n] - 1 within each coin (pandas `groupby.pct_change(n)`)."""
+    out = np.full(seg.n, np.nan)
+    ok = seg.pos >= n
+    i = np.flatnonzero(ok)
+    out[i] = x[i] / x[i - n] - 1
+    return out
+
+
+def _block_prefix(values, seg):
+    grid = np.zeros((seg.n_blocks, BLOCK))
+    grid[seg.block, seg.offset] = values
+    np.cumsum(grid, axis=1, out=grid)
+    return grid[seg.block, seg.offset]
+
+
+def rolling_std(x, seg, n, min_periods=None):
+    """
+    Sample std over the last `n` rows of each coin (pandas
+    `groupby.rolling(n, min_periods).std()`), from block-local prefix sums
+    of x, x² and the count of valid values — O(1) work per row whatever the
+    window length. NaNs are left out of the sums, so like pandas they only
+    affect the windows that contain them.
+    """
+    if n > BLOCK:
+        raise ValueError(f"window {n} exceeds block size {BLOCK}")
+    min_periods = n if min_periods is None else min_periods
+
+    i = np.arange(seg.n)
+    s = np.maximum(i - n + 1, seg.start)
+
+    valid = ~np.isnan(x)
+    gaps = not valid.all()
+    if gaps:
+        # centre each block on its first valid value (NaN-only blocks on 0)
+        first = np.flatnonzero(valid)[::-1]
+        block_ref = np.zeros(seg.n_blocks)
+        block_ref[seg.block[first]] = x[first]  # a block's earliest row is assigned last
+        ref = block_ref[seg.block]
+        c = np.where(valid, x - ref, 0.0)
+        p0 = _block_prefix(valid.astype(np.float64), seg)
+    else:
+        ref = x[seg.block_start]
+        c = x - ref
+        p0 = None  # no NaNs: a window's count is its length
+    p1 = _block_prefix(c, seg)
+    p2 = _block_prefix(c * c, seg)
+
+    # window entirely inside row i's block
+    before = np.maximum(s - 1, 0)
+    inside = s > seg.block_start
+    own = s >= seg.block_start
+
+    def window_sum(p):
+        return np.where(own, p - np.where(inside, p[before], 0.0), p)
+
+    k = window_sum(p0) if gaps else (i - s + 1).astype(np.float64)
+    s1 = window_sum(p1)
+    s2 = window_sum(p2)
+
+    # window starting in the previous block: re-centre that part on ref[i]
+    split = s < seg.block_start
+    if split.any():
+        j = np.flatnonzero(split)
+        last = seg.block_start[j] - 1
+        head = np.maximum(s[j] - 1, 0)
+        has_head = s[j] > seg.block_start[last]
+
+        def head_sum(p):
+            return p[last] - np.where(has_head, p[head], 0.0)
+
+        a0 = head_sum(p0) if gaps else (last - s[j] + 1).astype(np.float64)
+        a1 = head_sum(p1)
+        a2 = head_sum(p2)
+        delta = ref[last] - ref[j]
+        if gaps:
+            k[j] = p0[j] + a0
+        s1[j] = p1[j] + a1 + a0 * delta
+        s2[j] = p2[j] + a2 + 2 * delta * a1 + a0 * delta * delta
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        var = (s2 - s1 * s1 / k) / (k - 1)
+
+    # flat windows are exactly 0, like pandas, rather than rounding noise:
+    # every valid value after the window's first equals the one before it
+    if gaps:
+        prev = np.empty(seg.n, dtype=np.int64)
+        prev[0] = -1
+        prev[1:] = np.maximum.accumulate(np.where(valid, i, -1))[:-1]
+        nxt = np.minimum.accumulate(np.where(valid, i, seg.n)[::-1])[::-1]
+        f = np.minimum(nxt[s], i)
+    else:
+        prev = i - 1
+        f = s
+    same = valid & (prev >= seg.start) & (x == x[np.maximum(prev, 0)])
+    repeats = np.cumsum(same)
+    var[(k >= 1) & (repeats - repeats[f] == k - 1)] = 0.0
+
+    out = np.sqrt(np.maximum(var, 0.0))
+    out[(k < min_periods) | (k < 2)] = np.nan
+    return out
+
+
+def _sort_order(codes, n_codes, ts):
+    """Stable (coin, timestamp) order, via one int64 key when it fits."""
+    if len(ts) == 0:
+        return np.arange(0)
+    rel = ts - ts.min()
+    span = int(rel.max()) + 1
+    if n_codes * span >= 2 ** 62:
+        return np.lexsort((ts, codes))
+    key = codes.astype(np.int64) * span + rel
+    order = np.argsort(key)
+    ranked = key[order]
+    if (ranked[1:] == ranked[:-1]).any():  # ties: keep input order among them
+        order = np.argsort(key, kind='stable')
+    return order
+
+
+def compute_features(df, vol_col='close', vol_min_periods=None,
+                     horizons=HORIZONS, forward=FORWARD):
+    """
+    Add the LSTM price features to `df` in one pass.
+
+    The frame is sorted once by (coin, timestamp); the forward return,
+    every ret_{n}m / vol_{n}m column and the cyclical hour are then
+    computed with flat array kernels over the contiguous coin segments,
+    instead of one `groupby('coin')` per column. Returns the sorted copy.
+    """
+    import pandas as pd
+
+    df = df.copy()
+    df['timestamp'] = pd.to_datetime(df['timestamp'])
+
+    codes, uniques = pd.factorize(df['coin'], sort=True)
+    order = _sort_order(codes, len(uniques), df['timestamp'].to_numpy(dtype='datetime64[ns]').view('i8'))
+    df = df.take(order)
+    seg = Segments(codes[order])
+
+    close = df['close'].to_numpy(dtype=np.float64)
+    vol_src = close if vol_col == 'close' else df[vol_col].to_numpy(dtype=np.float64)
+
+    df['future_close'] = shift_forward(close, seg, forward)
+    df[f'pct_return_{forward}m'] = df['future_close'].to_numpy() / close - 1
+
+    for n in horizons:
+        df[f'ret_{n}m'] = pct_change(close, seg, n)
+        df[f'vol_{n}m'] = rolling_std(vol_src, seg, n, vol_min_periods)
+
+    df['hour'] = df['timestamp'].dt.hour
+    df['sin_hour'] = np.sin(2 * np.pi * df['hour'] / 24)
+    df['cos_hour'] = np.cos(2 * np.pi * df['hour'] / 24)
+    return df
@@ -0,0 +1,95 @@
+import hashlib
+import logging
+import os
+import threading
+import warnings
+
+from .bundle import Bundle
+from .schema import FEATURES
+
+log = logging.getLogger(__name__)
+
+# Repository root, so the default weights resolve regardless of the cwd
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_WEIGHTS = os.path.join(ROOT, "best_lstm_model.pt")
+# Quantized TorchScript export of the weights (python -m lstm.export)
+DEFAULT_ARTIFACT = os.path.join(ROOT, "best_lstm_model.int8.pt")
+# Extra file in the artifact recording the sha256 of the weights it came from
+SOURCE_DIGEST = "source_weights.sha256"
+
+_model = None
+_lock = threading.Lock()
+
+# torch (and the model class) are imported inside the loaders, so importing
+# this module -- e.g. from the Flask app -- stays cheap until a first forecast.
+
+
+def load_model(path=DEFAULT_WEIGHTS):
+    """
+    Eval-mode model from a bundle written by lstm.train, taking raw features
+    and standardizing them with the bundled mean/std. Bare state_dicts from
+    before bundles are refused (python -m lstm.bundle upgrades them) unless
+    LSTM_ALLOW_UNSCALED=1, which serves them on unscaled features.
+    """
+    bundle = Bundle.load(path)
+    if bundle.features != FEATURES:
+        raise ValueError(f"{path} was trained on features {bundle.features}, serving expects {FEATURES}")
+    if bundle.scaler is None:
+        if os.getenv("LSTM_ALLOW_UNSCALED", "0") != "1":
+            raise ValueError(f"{path} has no feature scaler; upgrade it with python -m lstm.bundle "
+                             f"or set LSTM_ALLOW_UNSCALED=1 to serve it unscaled")
+        log.warning(f"{path} has no feature scaler; features are fed to the model unscaled")
+    model = bundle.build()
+    for p in model.parameters():
+        p.requires_grad_(False)
+    return model
+
+
+def weights_digest(path):
+    """sha256 of a weights file, as recorded in the artifacts exported from it."""
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def load_artifact(path=DEFAULT_ARTIFACT, weights=None):
+    """
+    The TorchScript artifact at `path`. Given `weights`, returns None instead
+    when the artifact was not exported from that exact file (e.g. retrained
+    since), so a stale quantized model is never served.
+    """
+    import torch
+
+    extra = {SOURCE_DIGEST: ""}
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", FutureWarning)
+        model = torch.jit.load(path, map_location=torch.device("cpu"), _extra_files=extra)
+    if weights is not None and os.path.exists(weights):
+        source = extra[SOURCE_DIGEST]
+        source = source.decode() if isinstance(source, bytes) else source
+        if source != weights_digest(weights):
+            log.warning(f"{path} was not exported from {weights}; ignoring it (re-run python -m lstm.export)")
+            return None
+    return model
+
+
+def get_model():
+    """
+    Process-wide LSTM, loaded from disk on first use.
+
+    The quantized TorchScript artifact is preferred when it exists
+    (LSTM_ARTIFACT, default best_lstm_model.int8.pt) and was exported from
+    the current LSTM_WEIGHTS; otherwise the eager float32 LSTMRegressor is
+    built from LSTM_WEIGHTS. The instance is shared
+    by every request thread and must be treated as read-only.
+    """
+    global _model
+    if _model is None:
+        with _lock:
+            if _model is None:
+                artifact = os.getenv("LSTM_ARTIFACT", DEFAULT_ARTIFACT)
+                weights = os.getenv("LSTM_WEIGHTS", DEFAULT_WEIGHTS)
+                if artifact and os.path.exists(artifact):
+                    _model = load_artifact(artifact, weights)
+                if _model is None:
+                    _model = load_model(weights)
+    return _model
@@ -0,0 +1,34 @@
+import torch
+import torch.nn as nn
+
+from .schema import FEATURES, TARGET, SEQUENCE_LENGTH  # noqa: F401  (re-exported)
+
+
+class LSTMRegressor(nn.Module):
+    def __init__(self, input_dim, hidden_dim, num_layers=1):
+        super().__init__()
+        self.lstm = nn.LSTM(input_dim, hidden_dim, num_layers, batch_first=True)
+        self.dropout = nn.Dropout(0.3)
+        self.fc = nn.Linear(hidden_dim, 1)
+
+    def forward(self, x):
+        lstm_out, _ = self.lstm(x)
+        out = self.dropout(lstm_out[:, -1, :])
+        return self.fc(out)
+
+
+class Standardized(nn.Module):
+    """
+    `model` fed standardized features: (x - mean) / std in one broadcast
+    over the (batch, window, features) input, with the per-feature vectors
+    stored as buffers so they travel with TorchScript exports.
+    """
+
+    def __init__(self, model, mean, std):
+        super().__init__()
+        self.model = model
+        self.register_buffer("mean", torch.as_tensor(mean, dtype=torch.float32))
+        self.register_buffer("std", torch.as_tensor(std, dtype=torch.float32))
+
+    def forward(self, x):
+        return self.model((x - self.mean) / self.std)
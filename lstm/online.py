@@ -0,0 +1,204 @@
+import math
+import threading
+
+import numpy as np
+
+from .features import HORIZONS
+from .schema import FEATURES, SEQUENCE_LENGTH
+
+SENTIMENT = {'positive': 1.0, 'neutral': 0.0, 'negative': -1.0}
+
+# Running sums drift a little with every add/remove; rebuilding them from
+# the ring buffer this often keeps the error at the level of a fresh sum.
+RESYNC_EVERY = 4096
+
+
+class Ring:
+    """Fixed-capacity float ring buffer, newest value at `ago(0)`."""
+
+    def __init__(self, capacity):
+        self.buf = np.full(capacity, np.nan)
+        self.capacity = capacity
+        self.head = 0   # next write position
+        self.size = 0
+
+    def push(self, value):
+        """Append `value`; returns the value it evicted (NaN if none)."""
+        old = self.buf[self.head] if self.size == self.capacity else math.nan
+        self.buf[self.head] = value
+        self.head = (self.head + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+        return old
+
+    def ago(self, k):
+        """The value pushed `k` steps before the newest one."""
+        return self.buf[(self.head - 1 - k) % self.capacity]
+
+    def ordered(self):
+        """Contents oldest-first (one copy)."""
+        if self.size < self.capacity:
+            return self.buf[:self.size].copy()
+        return np.concatenate((self.buf[self.head:], self.buf[:self.head]))
+
+
+class RollingStd:
+    """
+    Sample std of the last `n` values, updated in O(1) per value.
+
+    Sums are kept relative to a reference value (the first one seen, then
+    the window mean at each resync) so price-sized inputs do not cancel
+    catastrophically, and a run of identical values reports exactly 0.
+    """
+
+    def __init__(self, n, min_periods=None):
+        self.n = n
+        self.min_periods = n if min_periods is None else min_periods
+        self.ring = Ring(n)
+        self.ref = None
+        self.s1 = 0.0
+        self.s2 = 0.0
+        self.run = 0        # length of the current run of equal values
+        self.updates = 0
+
+    def push(self, x):
+        if self.ref is None:
+            self.ref = x
+        self.run = self.run + 1 if self.ring.size and x == self.ring.ago(0) else 1
+        old = self.ring.push(x)
+        c = x - self.ref
+        self.s1 += c
+        self.s2 += c * c
+        if not math.isnan(old):
+            c = old - self.ref
+            self.s1 -= c
+            self.s2 -= c * c
+        self.updates += 1
+        if self.updates % RESYNC_EVERY == 0:
+            self._resync()
+        return self.value()
+
+    def _resync(self):
+        values = self.ring.ordered()
+        self.ref = float(values.mean())
+        c = values - self.ref
+        self.s1 = float(c.sum())
+        self.s2 = float((c * c).sum())
+
+    def value(self):
+        k = self.ring.size
+        if k < max(self.min_periods, 2):
+            return math.nan
+        if self.run >= k:
+            return 0.0
+        var = (self.s2 - self.s1 * self.s1 / k) / (k - 1)
+        return math.sqrt(max(var, 0.0))
+
+
+def _hour(timestamp):
+    if hasattr(timestamp, 'hour'):
+        return timestamp.hour
+    if isinstance(timestamp, np.datetime64):
+        return int(timestamp.astype('datetime64[h]').astype(np.int64) % 24)
+    return int(timestamp // 3_600_000 % 24)  # epoch milliseconds, UTC
+
+
+def _sentiment(value):
+    if isinstance(value, str):
+        return SENTIMENT.get(value, math.nan)
+    return math.nan if value is None else float(value)
+
+
+class CoinState:
+    """
+    Online LSTM features for one coin.
+
+    Each `update` folds one bar into fixed-size ring buffers and running
+    sums, so the nine FEATURES of the newest bar cost O(1) whatever the
+    history length. Complete feature rows (no NaN, the same rows
+    `preprocess_data` keeps) are pushed into a `window`-row ring that backs
+    `window()`.
+    """
+
+    def __init__(self, window=SEQUENCE_LENGTH, horizons=HORIZONS,
+                 vol_col='close', vol_min_periods=None):
+        self.horizons = tuple(horizons)
+        self.vol_col = vol_col
+        self.close = Ring(max(self.horizons) + 1)
+        self.vol = [RollingStd(n, vol_min_periods) for n in self.horizons]
+        self.rows = np.full((window, len(FEATURES)), np.nan, dtype=np.float32)
+        self.head = 0
+        self.size = 0
+        self.latest = None    # FEATURES of the newest bar, complete or not
+        self.timestamp = None
+
+    def update(self, timestamp, close, volume=0.0, sentiment=0.0):
+        close = float(close)
+        self.close.push(close)
+        x = close if self.vol_col == 'close' else float(volume)
+
+        rets = []
+        for n in self.horizons:
+            prev = self.close.ago(n) if self.close.size > n else math.nan
+            rets.append(close / prev - 1)
+        vols = [v.push(x) for v in self.vol]
+
+        angle = 2 * math.pi * _hour(timestamp) / 24
+        row = [_sentiment(sentiment), *rets, *vols, math.sin(angle), math.cos(angle)]
+        self.latest = row
+        self.timestamp = timestamp
+
+        if not any(math.isnan(v) for v in row):
+            self.rows[self.head] = row
+            self.head = (self.head + 1) % len(self.rows)
+            self.size = min(self.size + 1, len(self.rows))
+        return row
+
+    def ready(self):
+        return self.size == len(self.rows)
+
+    def window(self):
+        """The last `window` complete feature rows, oldest first, or None."""
+        if not self.ready():
+            return None
+        return np.concatenate((self.rows[self.head:], self.rows[:self.head]))
+
+
+class OnlineFeatures:
+    """Per-coin `CoinState`s behind one lock, for live inference."""
+
+    def __init__(self, **options):
+        self.options = options
+        self._states = {}
+        self._lock = threading.Lock()
+
+    def update(self, coin, timestamp, close, volume=0.0, sentiment=0.0):
+        with self._lock:
+            state = self._states.get(coin)
+            if state is None:
+                state = self._states[coin] = CoinState(**self.options)
+            return state.update(timestamp, close, volume, sentiment)
+
+    def seed(self, coin, timestamps, close, volume=None, sentiment=None):
+        """Replace a coin's state by replaying its history bar by bar."""
+        state = CoinState(**self.options)
+        volume = np.zeros(len(close)) if volume is None else volume
+        sentiment = np.zeros(len(close)) if sentiment is None else sentiment
+        for row in zip(timestamps, close, volume, sentiment):
+            state.update(*row)
+        with self._lock:
+            self._states[coin] = state
+        return state
+
+    def window(self, coin):
+        with self._lock:
+            state = self._states.get(coin)
+            return None if state is None else state.window()
+
+    def latest(self, coin):
+        with self._lock:
+            state = self._states.get(coin)
+            return None if state is None else dict(zip(FEATURES, state.latest))
+
+    def coins(self):
+        with self._lock:
+            return list(self._states)
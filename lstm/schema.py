@@ -0,0 +1,13 @@
+# ────────────────────────────────────────────────────────────────
+# Feature layout shared by training and serving
+# ────────────────────────────────────────────────────────────────
+# Kept free of torch so the serving side can import it without loading
+# the deep-learning stack.
+FEATURES = [
+    "sentiment_num",
+    "ret_5m", "ret_15m", "ret_30m",
+    "vol_5m", "vol_15m", "vol_30m",
+    "sin_hour", "cos_hour"
+]
+TARGET = "pct_return_60m"
+SEQUENCE_LENGTH = 20
@@ -0,0 +1,372 @@
+"""
+Walk-forward cross-validation and hyperparameter sweeps over a process pool.
+
+    python -m lstm.sweep --data crypto_news_features.parquet --folds 4 \
+        --hidden-dim 32 64 --sequence-length 10 20 --workers 4
+    python -m lstm.sweep --model gbr --n-estimators 100 300 --max-depth 2 3
+
+Folds are expanding windows in time: fold k tests on the k-th of `folds`
+consecutive time blocks after the first `min_train` share of the history
+and trains on every sample whose target was already known when the block
+starts. pct_return_60m looks FORWARD rows (articles) ahead in the same coin,
+which can be days later, so a label counts as known at the time of that
+row, not 60 minutes after its own. LSTM early stopping validates on the
+chronologically last 10% of the training samples, cut the same way,
+instead of a random split.
+
+The feature rows are copied once into shared memory; every worker maps the
+same blocks and cuts its windows from them as views, so the dataset is not
+pickled or copied per process. Each (fold, config) job reports RMSE,
+directional accuracy and wall time, and the results are gathered into one
+leaderboard averaged over folds.
+"""
+import argparse
+import csv
+import itertools
+import os
+import tempfile
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .features import FORWARD
+from .schema import FEATURES, TARGET, SEQUENCE_LENGTH
+
+MINUTE_NS = 60 * 10**9
+
+
+# ────────────────────────────────────────────────────────────────
+# Shared feature arrays
+# ────────────────────────────────────────────────────────────────
+class SharedArrays:
+    """
+    Named numpy arrays copied once into shared memory blocks. `spec` is a
+    small picklable description that other processes pass to `attach` to
+    map the same memory without copying it.
+    """
+
+    def __init__(self, arrays):
+        self.spec = {}
+        self.arrays = {}
+        self._blocks = []
+        for name, arr in arrays.items():
+            arr = np.ascontiguousarray(arr)
+            shm = SharedMemory(create=True, size=max(arr.nbytes, 1))
+            self._blocks.append(shm)
+            view = np.ndarray(arr.shape, arr.dtype, buffer=shm.buf)
+            view[...] = arr
+            self.arrays[name] = view
+            self.spec[name] = (shm.name, arr.shape, arr.dtype.str)
+
+    @staticmethod
+    def attach(spec):
+        """(arrays, blocks) mapped from `spec`; the blocks must outlive the arrays."""
+        arrays, blocks = {}, []
+        for name, (shm_name, shape, dtype) in spec.items():
+            shm = SharedMemory(name=shm_name)
+            blocks.append(shm)
+            arrays[name] = np.ndarray(shape, np.dtype(dtype), buffer=shm.buf)
+        return arrays, blocks
+
+    def close(self):
+        self.arrays = {}
+        for shm in self._blocks:
+            shm.close()
+            shm.unlink()
+        self._blocks = []
+
+
+def _epoch_ns(ts):
+    ts = ts.dt.tz_convert("UTC").dt.tz_localize(None) if ts.dt.tz is not None else ts
+    return ts.to_numpy(dtype="datetime64[ns]").view(np.int64)
+
+
+def load_rows(path, forward=FORWARD):
+    """
+    Feature rows ordered by (coin, time), as flat arrays plus coin segment
+    bounds. `known` is when each row's target is known: the time of the row
+    `forward` rows later in the same coin (never, if that row is missing).
+    """
+    from dataset import read_table
+
+    df = read_table(path, columns=["coin", "timestamp"] + FEATURES + [TARGET])
+    df = df.sort_values(["coin", "timestamp"]).reset_index(drop=True)
+    known = _epoch_ns(df.groupby("coin", sort=False)["timestamp"].shift(-forward))
+    keep = df[FEATURES + [TARGET]].notna().all(axis=1).to_numpy()
+    df = df[keep].reset_index(drop=True)
+    known = known[keep]
+    known[known == np.iinfo(np.int64).min] = np.iinfo(np.int64).max  # NaT
+
+    coins = df["coin"].to_numpy()
+    bounds = np.concatenate(([0], np.flatnonzero(coins[1:] != coins[:-1]) + 1, [len(df)]))
+    return {
+        "values": df[FEATURES].to_numpy(dtype=np.float32),
+        "target": df[TARGET].to_numpy(dtype=np.float64),
+        "time": _epoch_ns(df["timestamp"]),
+        "known": known,
+        "bounds": bounds.astype(np.int64),
+    }
+
+
+def window_samples(bounds, window):
+    """
+    (first row, target row) of every `window`-row window inside one coin;
+    the target is the row right after the window, as in lstm.windows.
+    """
+    starts = [np.arange(lo, hi - window) for lo, hi in zip(bounds[:-1], bounds[1:]) if hi - lo > window]
+    start = np.concatenate(starts) if starts else np.empty(0, dtype=np.int64)
+    return start, start + window
+
+
+def walk_forward_folds(times, folds, min_train=0.5):
+    """[(test_start, test_end)] of `folds` consecutive time blocks after the first `min_train` of the rows."""
+    edges = np.quantile(times, np.linspace(min_train, 1.0, folds + 1)).astype(np.int64)
+    edges[-1] = times.max() + 1
+    return [(int(lo), int(hi)) for lo, hi in zip(edges[:-1], edges[1:])]
+
+
+def embargoed(known, before, embargo):
+    """Mask of samples whose target is known at least `embargo` ns before `before`."""
+    return known <= before - embargo
+
+
+# ────────────────────────────────────────────────────────────────
+# Worker side
+# ────────────────────────────────────────────────────────────────
+_rows = None
+_blocks = None
+
+
+def _init_worker(spec, threads):
+    global _rows, _blocks
+    _rows, _blocks = SharedArrays.attach(spec)
+    if threads:
+        import torch
+        torch.set_num_threads(threads)
+
+
+def _scores(pred, y_true):
+    rmse = float(np.sqrt(np.mean((y_true - pred) ** 2)))
+    directional = float((np.sign(pred) == np.sign(y_true)).mean())
+    return rmse, directional
+
+
+def _fit_lstm(rows, train, test, config, embargo, seed):
+    import torch
+    from .bundle import Bundle, FeatureScaler
+    from .model import LSTMRegressor
+    from .train import train_fast
+
+    window = config["sequence_length"]
+    windows = sliding_window_view(rows["values"], window, axis=0).swapaxes(1, 2)  # view
+    (train_start, train_target), (test_start, test_target) = train, test
+
+    # chronological validation tail, embargoed like the test block
+    t = rows["time"][train_target]
+    val_from = np.sort(t)[-max(1, len(t) // 10)]
+    val = t >= val_from
+    fit = embargoed(rows["known"][train_target], val_from, embargo)
+
+    scaler = FeatureScaler.fit(windows[train_start[fit]])
+
+    def tensors(start, target):
+        return (torch.from_numpy(scaler.transform(windows[start])),
+                torch.from_numpy(rows["target"][target].astype(np.float32)).view(-1, 1))
+
+    X_fit, y_fit = tensors(train_start[fit], train_target[fit])
+    X_test, _ = tensors(test_start, test_target)
+
+    torch.manual_seed(seed)
+    model = LSTMRegressor(input_dim=len(FEATURES), hidden_dim=config["hidden_dim"])
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "model.pt")
+        train_fast(model, X_fit, y_fit, path, epochs=config["epochs"], patience=config["patience"],
+                   batch_size=config["batch_size"], lr=config["lr"], scaler=scaler, sequence_length=window,
+                   val=tensors(train_start[val], train_target[val]), verbose=False)
+        model.load_state_dict(Bundle.load(path).state_dict)
+    model.eval()
+    with torch.inference_mode():
+        pred = model(X_test).numpy().ravel()
+    return pred, int(fit.sum())
+
+
+def _fit_gbr(rows, train, test, config, embargo, seed):
+    from sklearn.ensemble import GradientBoostingRegressor
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import StandardScaler
+
+    pipe = Pipeline([
+        ("scaler", StandardScaler()),
+        ("gbr", GradientBoostingRegressor(
+            n_estimators=config["n_estimators"],
+            max_depth=config["max_depth"],
+            learning_rate=config["learning_rate"],
+            random_state=seed
+        ))
+    ])
+    pipe.fit(rows["values"][train[0]], rows["target"][train[1]])
+    return pipe.predict(rows["values"][test[0]]), len(train[0])
+
+
+MODELS = {"lstm": _fit_lstm, "gbr": _fit_gbr}
+
+
+def run_job(fold, span, config, embargo, seed):
+    """Train `config` on fold `fold` and score it on the fold's test block."""
+    started = time.perf_counter()
+    model = config["model"]
+    window = config.get("sequence_length", 0)  # the GBR model scores single rows
+    start, target = window_samples(_rows["bounds"], window) if window else (np.arange(len(_rows["time"])),) * 2
+    t = _rows["time"][target]
+    test_start, test_end = span
+    train = embargoed(_rows["known"][target], test_start, embargo)
+    test = (t >= test_start) & (t < test_end)
+    if not train.any() or not test.any():
+        raise ValueError(f"fold {fold} has {train.sum()} training and {test.sum()} test samples")
+
+    pred, n_train = MODELS[model](_rows, (start[train], target[train]), (start[test], target[test]),
+                                  config, embargo, seed + fold)
+    rmse, directional = _scores(pred, _rows["target"][target[test]])
+    return {
+        "config": config, "fold": fold, "rmse": rmse, "directional": directional,
+        "train": n_train, "test": int(test.sum()), "seconds": time.perf_counter() - started,
+    }
+
+
+# ────────────────────────────────────────────────────────────────
+# Sweep and leaderboard
+# ────────────────────────────────────────────────────────────────
+def grid(**axes):
+    """Every combination of the hyperparameter lists in `axes`, as dicts."""
+    return [dict(zip(axes, values)) for values in itertools.product(*axes.values())]
+
+
+def sweep(path, configs, folds=4, min_train=0.5, workers=None, threads=None,
+          embargo_minutes=0, seed=0):
+    """Run every config on every fold across a process pool; returns the per-fold results."""
+    workers = workers or os.cpu_count()
+    if threads is None and any(c["model"] == "lstm" for c in configs):
+        threads = max(1, os.cpu_count() // workers)
+    embargo = embargo_minutes * MINUTE_NS
+
+    shared = SharedArrays(load_rows(path))
+    spans = walk_forward_folds(shared.arrays["time"], folds, min_train)
+    results = []
+    try:
+        with ProcessPoolExecutor(workers, mp_context=get_context("spawn"),
+                                 initializer=_init_worker, initargs=(shared.spec, threads)) as pool:
+            jobs = {
+                pool.submit(run_job, fold, span, config, embargo, seed): (fold, config)
+                for config in configs for fold, span in enumerate(spans)
+            }
+            for done, future in enumerate(as_completed(jobs), 1):
+                fold, config = jobs[future]
+                try:
+                    r = future.result()
+                except Exception as e:
+                    print(f"[{done}/{len(jobs)}] fold {fold} {config}: failed ({e})")
+                    continue
+                results.append(r)
+                print(f"[{done}/{len(jobs)}] fold {fold} {_describe(config)}: "
+                      f"RMSE {r['rmse']:.6f}  dir {r['directional']:.2%}  {r['seconds']:.1f}s")
+    finally:
+        shared.close()
+    return results
+
+
+def leaderboard(results):
+    """One row per config, best mean RMSE first: fold means, RMSE spread and summed wall time."""
+    by_config = defaultdict(list)
+    for r in results:
+        by_config[tuple(sorted(r["config"].items()))].append(r)
+    board = []
+    for runs in by_config.values():
+        rmse = np.array([r["rmse"] for r in runs])
+        board.append({
+            "config": runs[0]["config"],
+            "folds": len(runs),
+            "rmse": float(rmse.mean()),
+            "rmse_std": float(rmse.std()),
+            "directional": float(np.mean([r["directional"] for r in runs])),
+            "seconds": float(sum(r["seconds"] for r in runs)),
+        })
+    return sorted(board, key=lambda row: row["rmse"])
+
+
+def _describe(config):
+    return " ".join(f"{k}={v}" for k, v in config.items() if k not in ("model", "epochs", "patience"))
+
+
+def format_leaderboard(board):
+    lines = [f"{'rank':>4}  {'RMSE':>10}  {'± fold':>9}  {'dir acc':>7}  {'folds':>5}  {'time':>8}  config"]
+    for rank, row in enumerate(board, 1):
+        lines.append(f"{rank:>4}  {row['rmse']:>10.6f}  {row['rmse_std']:>9.6f}  {row['directional']:>7.2%}  "
+                     f"{row['folds']:>5}  {row['seconds']:>7.1f}s  {row['config']['model']} {_describe(row['config'])}")
+    return "\n".join(lines)
+
+
+def write_results(results, path):
+    keys = sorted({k for r in results for k in r["config"]})
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(keys + ["fold", "rmse", "directional", "train", "test", "seconds"])
+        for r in results:
+            writer.writerow([r["config"].get(k, "") for k in keys]
+                            + [r[k] for k in ("fold", "rmse", "directional", "train", "test", "seconds")])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Walk-forward CV and hyperparameter sweep.")
+    parser.add_argument("--data", default="crypto_news_features.parquet")
+    parser.add_argument("--model", choices=sorted(MODELS), default="lstm")
+    parser.add_argument("--folds", type=int, default=4)
+    parser.add_argument("--min-train", type=float, default=0.5, help="share of the history before the first test block")
+    parser.add_argument("--embargo", type=int, default=0,
+                        help="extra minutes between a training target becoming known and a test block")
+    parser.add_argument("--workers", type=int, help="processes (default: CPU count)")
+    parser.add_argument("--threads", type=int, help="torch threads per worker (default: CPUs / workers)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="also write the per-fold results as CSV")
+    lstm = parser.add_argument_group("lstm grid")
+    lstm.add_argument("--hidden-dim", type=int, nargs="+", default=[64])
+    lstm.add_argument("--sequence-length", type=int, nargs="+", default=[SEQUENCE_LENGTH])
+    lstm.add_argument("--lr", type=float, nargs="+", default=[0.001])
+    lstm.add_argument("--batch-size", type=int, nargs="+", default=[512])
+    lstm.add_argument("--epochs", type=int, default=20)
+    lstm.add_argument("--patience", type=int, default=3)
+    gbr = parser.add_argument_group("gbr grid")
+    gbr.add_argument("--n-estimators", type=int, nargs="+", default=[300])
+    gbr.add_argument("--max-depth", type=int, nargs="+", default=[3])
+    gbr.add_argument("--learning-rate", type=float, nargs="+", default=[0.05])
+    args = parser.parse_args(argv)
+
+    if args.model == "lstm":
+        configs = grid(model=["lstm"], hidden_dim=args.hidden_dim, sequence_length=args.sequence_length,
+                       lr=args.lr, batch_size=args.batch_size, epochs=[args.epochs], patience=[args.patience])
+    else:
+        configs = grid(model=["gbr"], n_estimators=args.n_estimators, max_depth=args.max_depth,
+                       learning_rate=args.learning_rate)
+
+    started = time.perf_counter()
+    results = sweep(args.data, configs, args.folds, args.min_train, args.workers, args.threads,
+                    args.embargo, args.seed)
+    wall = time.perf_counter() - started
+    if not results:
+        raise SystemExit("no job succeeded")
+
+    print()
+    print(format_leaderboard(leaderboard(results)))
+    busy = sum(r["seconds"] for r in results)
+    print(f"\n{len(results)} jobs in {wall:.1f}s wall ({busy:.1f}s of job time)")
+    if args.out:
+        write_results(results, args.out)
+        print(f"saved {args.out}")
+
+
+if __name__ == "__main__":
+    main()
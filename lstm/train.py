@@ -0,0 +1,259 @@
+"""
+Train the LSTMRegressor on the engineered feature CSV.
+
+    python -m lstm.train --data crypto_news_features.parquet --out best_lstm_model.pt
+    python -m lstm.train --fast --batch-size 512 --threads 8 --bf16
+
+--fast swaps the DataLoader loop for one over pre-shuffled contiguous
+tensors (see train_fast). The output is a model bundle (lstm/bundle.py): weights plus the feature
+scaler fitted on the training split, which serving applies to raw features.
+"""
+import argparse
+import contextlib
+import time
+
+import numpy as np
+import torch
+import torch.nn as nn
+from torch.utils.data import DataLoader, TensorDataset, random_split
+
+from dataset import read_table
+from .bundle import Bundle, FeatureScaler
+from .model import LSTMRegressor, FEATURES, TARGET, SEQUENCE_LENGTH
+from .windows import coin_windows, stack_windows
+
+
+# ────────────────────────────────────────────────────────────────
+# 1. Load & preprocess
+# ────────────────────────────────────────────────────────────────
+def load_features(path):
+    df = read_table(path, columns=["coin", "timestamp"] + FEATURES + [TARGET])
+    df = df.sort_values(["coin", "timestamp"]).reset_index(drop=True)
+    return df.dropna(subset=FEATURES + [TARGET])
+
+
+# ────────────────────────────────────────────────────────────────
+# 2. Create sequences
+# ────────────────────────────────────────────────────────────────
+def create_sequences(data, target_col, window):
+    pairs = coin_windows(data, FEATURES, window, target=target_col)
+    Xs = [X for X, _ in pairs if len(X)]
+    ys = [y for X, y in pairs if len(X)]
+    if not Xs:
+        return np.empty((0, window, len(FEATURES))), np.empty((0,))
+    return stack_windows(Xs), np.concatenate(ys)
+
+
+def split_train_test(X, y, train_frac=0.8):
+    """Chronological split: the first `train_frac` of the windows train."""
+    split = int(len(X) * train_frac)
+    return (X[:split], y[:split]), (X[split:], y[split:])
+
+
+# ────────────────────────────────────────────────────────────────
+# 3. Normalize features
+# ────────────────────────────────────────────────────────────────
+def scale_features(X_train, X_test):
+    """Fit the per-feature scaler on the training windows; float32 outputs."""
+    scaler = FeatureScaler.fit(X_train)
+    return scaler.transform(X_train), scaler.transform(X_test), scaler
+
+
+# ────────────────────────────────────────────────────────────────
+# 4. Training with early stopping
+# ────────────────────────────────────────────────────────────────
+def train(model, X_train_t, y_train_t, out_path, epochs=50, patience=5, batch_size=32, lr=0.001,
+          scaler=None, sequence_length=SEQUENCE_LENGTH):
+    criterion = nn.MSELoss()
+    optimizer = torch.optim.Adam(model.parameters(), lr=lr)
+
+    # Split training set into train/val (90/10)
+    val_size = int(0.1 * len(X_train_t))
+    train_size = len(X_train_t) - val_size
+    train_ds, val_ds = random_split(TensorDataset(X_train_t, y_train_t), [train_size, val_size])
+
+    train_loader = DataLoader(train_ds, batch_size=batch_size, shuffle=True)
+    val_loader = DataLoader(val_ds, batch_size=batch_size)
+
+    best_val_loss = np.inf
+    patience_counter = 0
+
+    for epoch in range(epochs):
+        started = time.perf_counter()
+        model.train()
+        train_loss = 0
+        for Xb, yb in train_loader:
+            optimizer.zero_grad()
+            preds = model(Xb)
+            loss = criterion(preds, yb)
+            loss.backward()
+            optimizer.step()
+            train_loss += loss.item()
+
+        # Validation
+        model.eval()
+        val_loss = 0
+        with torch.no_grad():
+            for Xv, yv in val_loader:
+                vp = model(Xv)
+                val_loss += criterion(vp, yv).item()
+        val_loss /= len(val_loader)
+
+        rate = train_size / (time.perf_counter() - started)
+        print(f"Epoch {epoch+1:02d} - Train Loss: {train_loss/len(train_loader):.6f} | Val Loss: {val_loss:.6f}"
+              f" | {rate:,.0f} samples/s")
+
+        # Early stopping
+        if val_loss < best_val_loss:
+            best_val_loss = val_loss
+            patience_counter = 0
+            Bundle.from_model(model, scaler, sequence_length=sequence_length).save(out_path)
+        else:
+            patience_counter += 1
+            if patience_counter >= patience:
+                print("⏹️ Early stopping triggered.")
+                break
+
+
+def train_fast(model, X_train_t, y_train_t, out_path, epochs=50, patience=5, batch_size=512, lr=0.001,
+               scaler=None, sequence_length=SEQUENCE_LENGTH, threads=None, compile=False, bf16=False,
+               val=None, verbose=True):
+    """
+    Same training, early stopping and checkpoints as `train`, without the
+    per-batch Python overhead of DataLoader:
+
+    - the 90/10 train/val split is gathered once into contiguous tensors;
+      every epoch reshuffles the training rows with one gather and the
+      batches are plain slices (views) of it;
+    - the running loss stays on the tensor side and is read once per
+      epoch, and validation is a single forward pass;
+    - `threads` sets torch's intra-op thread count, `compile` trains a
+      torch.compile'd model and `bf16` runs forward passes under CPU
+      bfloat16 autocast (the loss is still computed in float32).
+
+    `val` = (X_val, y_val) replaces the random 10% validation split, e.g.
+    with the chronologically last windows so no future data leaks into
+    early stopping (lstm/sweep.py).
+    """
+    if threads:
+        torch.set_num_threads(threads)
+    criterion = nn.MSELoss()
+    optimizer = torch.optim.Adam(model.parameters(), lr=lr)
+    step = torch.compile(model) if compile else model
+    autocast = (lambda: torch.autocast("cpu", dtype=torch.bfloat16)) if bf16 else contextlib.nullcontext
+
+    if val is None:
+        val_size = int(0.1 * len(X_train_t))
+        order = torch.randperm(len(X_train_t))
+        X_val, y_val = X_train_t[order[:val_size]], y_train_t[order[:val_size]]
+        X_fit, y_fit = X_train_t[order[val_size:]], y_train_t[order[val_size:]]
+    else:
+        (X_val, y_val), X_fit, y_fit = val, X_train_t, y_train_t
+    n = len(X_fit)
+
+    best_val_loss = np.inf
+    patience_counter = 0
+
+    for epoch in range(epochs):
+        started = time.perf_counter()
+        model.train()
+        perm = torch.randperm(n)
+        X_epoch, y_epoch = X_fit[perm], y_fit[perm]
+        train_loss = torch.zeros(())
+        for lo in range(0, n, batch_size):
+            Xb, yb = X_epoch[lo:lo + batch_size], y_epoch[lo:lo + batch_size]
+            optimizer.zero_grad(set_to_none=True)
+            with autocast():
+                preds = step(Xb)
+            loss = criterion(preds.float(), yb)
+            loss.backward()
+            optimizer.step()
+            train_loss += loss.detach() * len(Xb)
+
+        model.eval()
+        with torch.inference_mode(), autocast():
+            val_loss = criterion(step(X_val).float(), y_val).item()
+        train_loss = train_loss.item() / n
+
+        rate = n / (time.perf_counter() - started)
+        if verbose:
+            print(f"Epoch {epoch+1:02d} - Train Loss: {train_loss:.6f} | Val Loss: {val_loss:.6f}"
+                  f" | {rate:,.0f} samples/s")
+
+        if val_loss < best_val_loss:
+            best_val_loss = val_loss
+            patience_counter = 0
+            Bundle.from_model(model, scaler, sequence_length=sequence_length).save(out_path)
+        else:
+            patience_counter += 1
+            if patience_counter >= patience:
+                if verbose:
+                    print("⏹️ Early stopping triggered.")
+                break
+
+
+# ────────────────────────────────────────────────────────────────
+# 5. Evaluation
+# ────────────────────────────────────────────────────────────────
+def evaluate(model, X_test_t, y_test_t):
+    model.eval()
+    with torch.no_grad():
+        pred = model(X_test_t).numpy().flatten()
+        y_true = y_test_t.numpy().flatten()
+        rmse = np.sqrt(np.mean((y_true - pred) ** 2))
+        directional = (np.sign(pred) == np.sign(y_true)).mean()
+    return rmse, directional
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train the LSTM return regressor.")
+    parser.add_argument("--data", default="crypto_news_features.parquet")
+    parser.add_argument("--out", default="best_lstm_model.pt")
+    parser.add_argument("--sequence-length", type=int, default=SEQUENCE_LENGTH)
+    parser.add_argument("--hidden-dim", type=int, default=64)
+    parser.add_argument("--epochs", type=int, default=50)
+    parser.add_argument("--patience", type=int, default=5)
+    parser.add_argument("--batch-size", type=int, help="default 32, or 512 with --fast")
+    parser.add_argument("--lr", type=float, default=0.001)
+    parser.add_argument("--fast", action="store_true", help="index-batched loop without DataLoader")
+    parser.add_argument("--threads", type=int, help="torch intra-op threads (--fast)")
+    parser.add_argument("--compile", action="store_true", help="torch.compile the model (--fast)")
+    parser.add_argument("--bf16", action="store_true", help="bfloat16 autocast on CPU (--fast)")
+    args = parser.parse_args(argv)
+
+    df = load_features(args.data)
+    X, y = create_sequences(df, TARGET, args.sequence_length)
+
+    # Train/Test split
+    (X_train, y_train), (X_test, y_test) = split_train_test(X, y)
+    X_train_scaled, X_test_scaled, scaler = scale_features(X_train, X_test)
+
+    # PyTorch tensors (the scaled arrays are already float32: no copy)
+    X_train_t = torch.from_numpy(X_train_scaled)
+    y_train_t = torch.tensor(y_train, dtype=torch.float32).view(-1, 1)
+    X_test_t = torch.from_numpy(X_test_scaled)
+    y_test_t = torch.tensor(y_test, dtype=torch.float32).view(-1, 1)
+
+    model = LSTMRegressor(input_dim=X.shape[2], hidden_dim=args.hidden_dim)
+    if args.fast:
+        train_fast(model, X_train_t, y_train_t, args.out,
+                   epochs=args.epochs, patience=args.patience,
+                   batch_size=args.batch_size or 512, lr=args.lr,
+                   scaler=scaler, sequence_length=args.sequence_length,
+                   threads=args.threads, compile=args.compile, bf16=args.bf16)
+    else:
+        train(model, X_train_t, y_train_t, args.out,
+              epochs=args.epochs, patience=args.patience,
+              batch_size=args.batch_size or 32, lr=args.lr,
+              scaler=scaler, sequence_length=args.sequence_length)
+
+    # Load best model
+    model.load_state_dict(Bundle.load(args.out).state_dict)
+    rmse, directional = evaluate(model, X_test_t, y_test_t)
+
+    print(f"\n📉 Final RMSE (PyTorch LSTM): {rmse:.6f}")
+    print(f"📈 Final Directional Accuracy: {directional:.2%}")
+
+
+if __name__ == "__main__":
+    main()
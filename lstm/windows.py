@@ -0,0 +1,51 @@
+import numpy as np
+import torch
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def sliding_windows(values, window):
+    """
+    All length-`window` windows over the rows of a 2-D array, as a
+    read-only (n - window + 1, window, n_features) view — nothing is copied.
+    """
+    values = np.asarray(values)
+    if len(values) < window:
+        return np.empty((0, window) + values.shape[1:], dtype=values.dtype)
+    return sliding_window_view(values, window, axis=0).swapaxes(1, 2)
+
+
+def coin_windows(df, features, window, target=None, group="coin"):
+    """
+    Per-coin windows over `df`, which must already be ordered by (coin, time).
+
+    The feature matrix is extracted once; every coin gets a zero-copy view
+    over its own contiguous rows. With `target`, each window is paired with
+    the target of the row right after it (so the last window is dropped).
+    Returns a list of (X_view, y) tuples, one per coin.
+    """
+    values = df[features].to_numpy()
+    y_all = df[target].to_numpy() if target is not None else None
+
+    coins = df[group].to_numpy()
+    bounds = np.flatnonzero(coins[1:] != coins[:-1]) + 1
+    starts = np.concatenate(([0], bounds))
+    stops = np.concatenate((bounds, [len(coins)]))
+
+    out = []
+    for lo, hi in zip(starts, stops):
+        X = sliding_windows(values[lo:hi], window)
+        if target is None:
+            out.append((X, None))
+        else:
+            out.append((X[:-1], y_all[lo + window:hi]))
+    return out
+
+
+def stack_windows(views):
+    """Materialise a list of window views into one contiguous array."""
+    return np.concatenate(views, axis=0)
+
+
+def to_tensor(views):
+    """Stack window views straight into a float32 tensor (one copy)."""
+    return torch.from_numpy(stack_windows(views).astype(np.float32, copy=False))
@@ -0,0 +1,2 @@
+from .engine import FinbertScorer, MODEL_NAME
+from .cache import SentimentCache
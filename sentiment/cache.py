@@ -0,0 +1,73 @@
+import hashlib
+import sqlite3
+import threading
+import unicodedata
+
+# SQLite caps bound parameters per statement; stay well below it
+_LOOKUP_CHUNK = 500
+
+
+def normalize(text):
+    """Canonical form of a headline: NFKC, whitespace collapsed, stripped."""
+    return " ".join(unicodedata.normalize("NFKC", text).split())
+
+
+def cache_key(text, model_id):
+    return hashlib.sha256(f"{model_id}\0{normalize(text)}".encode("utf-8")).digest()
+
+
+class SentimentCache:
+    """
+    Persistent, content-addressed store of FinBERT results.
+
+    Rows are keyed by sha256(model id + normalized headline), so the same
+    headline is scored once per model no matter how many dataset rows or
+    days it appears in. `hits` / `misses` count lookups since creation.
+    """
+
+    def __init__(self, path="sentiment_cache.sqlite"):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sentiment ("
+            " key BLOB PRIMARY KEY, label TEXT NOT NULL, score REAL NOT NULL"
+            ") WITHOUT ROWID"
+        )
+        self._conn.commit()
+
+    def get_many(self, keys):
+        """Return {key: (label, score)} for the keys that are cached."""
+        keys = list(keys)
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), _LOOKUP_CHUNK):
+                part = keys[start:start + _LOOKUP_CHUNK]
+                rows = self._conn.execute(
+                    f"SELECT key, label, score FROM sentiment WHERE key IN ({','.join('?' * len(part))})",
+                    part,
+                )
+                found.update((key, (label, score)) for key, label, score in rows)
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, items):
+        """Store an iterable of (key, label, score)."""
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO sentiment (key, label, score) VALUES (?, ?, ?)", items
+            )
+            self._conn.commit()
+
+    def stats(self):
+        total = self.hits + self.misses
+        rate = self.hits / total if total else 0.0
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": rate}
+
+    def close(self):
+        self._conn.close()
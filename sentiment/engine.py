@@ -0,0 +1,104 @@
+import numpy as np
+import torch
+import torch.nn as nn
+from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
+from dataset import iter_batches, TableWriter
+from .cache import cache_key
+
+MODEL_NAME = "yiyanghkust/finbert-tone"
+
+
+class FinbertScorer:
+    """
+    Batched FinBERT headline scorer.
+
+    Texts are tokenized once, sorted by token length and cut into batches so
+    each batch is only padded to its own longest member. Forward passes run
+    under `torch.inference_mode`; on CPU the Linear layers can optionally be
+    dynamically quantized to int8.
+    """
+
+    def __init__(self, model_name=MODEL_NAME, batch_size=64, device=None,
+                 quantize=False, max_length=512, cache=None):
+        self.model_name = model_name
+        self.model_id = f"{model_name}+int8" if quantize else model_name
+        self.cache = cache
+        self.batch_size = batch_size
+        self.max_length = max_length
+        self.device = torch.device(device or ("cuda" if torch.cuda.is_available() else "cpu"))
+
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        model = AutoModelForSequenceClassification.from_pretrained(model_name)
+        model.eval()
+        if quantize:
+            if self.device.type != "cpu":
+                raise ValueError("Dynamic int8 quantization is only supported on CPU")
+            model = torch.ao.quantization.quantize_dynamic(model, {nn.Linear}, dtype=torch.qint8)
+        self.model = model.to(self.device)
+        self.labels = [model.config.id2label[i].lower() for i in range(model.config.num_labels)]
+
+    def score(self, texts):
+        """
+        Return (labels, scores) for `texts`, in input order.
+
+        Duplicate headlines are scored once; with a SentimentCache attached,
+        headlines already in the cache are not scored at all.
+        """
+        texts = ["" if t is None or t != t else str(t) for t in texts]
+        keys = [cache_key(t, self.model_id) for t in texts]
+        unique = dict(zip(keys, texts))
+
+        results = self.cache.get_many(unique) if self.cache is not None else {}
+        pending = [key for key in unique if key not in results]
+        if pending:
+            labels, scores = self._run([unique[key] for key in pending])
+            fresh = list(zip(pending, labels, scores))
+            if self.cache is not None:
+                self.cache.put_many(fresh)
+            results.update((key, (label, score)) for key, label, score in fresh)
+
+        return [results[k][0] for k in keys], [results[k][1] for k in keys]
+
+    def _run(self, texts):
+        labels = np.empty(len(texts), dtype=object)
+        scores = np.empty(len(texts), dtype=np.float64)
+        if not texts:
+            return labels.tolist(), scores.tolist()
+
+        encoded = self.tokenizer(texts, truncation=True, max_length=self.max_length)
+        input_ids = encoded["input_ids"]
+        order = np.argsort([len(ids) for ids in input_ids], kind="stable")
+
+        with torch.inference_mode():
+            for start in range(0, len(order), self.batch_size):
+                idx = order[start:start + self.batch_size]
+                batch = self.tokenizer.pad(
+                    {key: [encoded[key][i] for i in idx] for key in encoded.keys()},
+                    return_tensors="pt",
+                ).to(self.device)
+                probs = torch.softmax(self.model(**batch).logits, dim=-1)
+                best, arg = probs.max(dim=-1)
+                labels[idx] = [self.labels[i] for i in arg.tolist()]
+                scores[idx] = best.float().cpu().numpy()
+
+        return labels.tolist(), np.round(scores, 4).tolist()
+
+    def score_file(self, input_path, output_path, text_col="headline", chunksize=10000):
+        """
+        Score `input_path` chunk by chunk and append each scored chunk to
+        `output_path`, so memory stays bounded by `chunksize` rows.
+        Parquet and CSV are both accepted, by file extension.
+        """
+        total = 0
+        with TableWriter(output_path, "sentiment") as writer:
+            for chunk in iter_batches(input_path, batch_size=chunksize):
+                chunk["sentiment_label"], chunk["sentiment_score"] = self.score(chunk[text_col].tolist())
+                writer.write(chunk)
+                total += len(chunk)
+                if self.cache is not None:
+                    stats = self.cache.stats()
+                    print(f"  scored {total:,} rows (cache hits {stats['hits']:,}, misses {stats['misses']:,})")
+                else:
+                    print(f"  scored {total:,} rows")
+        return total
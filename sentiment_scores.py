@@ -1,32 +1,43 @@
-import pandas as pd
-from transformers import AutoTokenizer, AutoModelForSequenceClassification, pipeline
-from tqdm import tqdm
-
-# Load dataset
-input_path = 'crypto_news_price_ohlc_dataset.csv'
-output_path = 'crypto_news_price_sentiment.csv'
-df = pd.read_csv(input_path)
-
-# Load FinBERT model and tokenizer
-print("Loading FinBERT model...")
-tokenizer = AutoTokenizer.from_pretrained("yiyanghkust/finbert-tone")
-model = AutoModelForSequenceClassification.from_pretrained("yiyanghkust/finbert-tone")
-sentiment_pipeline = pipeline("sentiment-analysis", model=model, tokenizer=tokenizer)
-
-# Analyze sentiment for each headline
-sentiment_labels = []
-sentiment_scores = []
-
-print("Running sentiment analysis on headlines...")
-for headline in tqdm(df['headline']):
-    result = sentiment_pipeline(headline)[0]
-    sentiment_labels.append(result['label'].lower())  # lowercase: positive/neutral/negative
-    sentiment_scores.append(round(result['score'], 4))  # rounded confidence score
-
-# Add results to DataFrame
-df['sentiment_label'] = sentiment_labels
-df['sentiment_score'] = sentiment_scores
-
-# Save to new CSV
-df.to_csv(output_path, index=False)
-print(f"✅ Sentiment scores added and saved to {output_path}")
\ No newline at end of file
+import argparse
+import time
+
+from sentiment import FinbertScorer, SentimentCache, MODEL_NAME
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Add FinBERT sentiment to the news/price dataset.")
+    parser.add_argument("--input", default="crypto_news_price_ohlc_dataset.parquet")
+    parser.add_argument("--output", default="crypto_news_price_sentiment.parquet")
+    parser.add_argument("--model", default=MODEL_NAME)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--chunksize", type=int, default=10000,
+                        help="rows read, scored and written per chunk")
+    parser.add_argument("--device", default=None, help="cpu / cuda (default: auto)")
+    parser.add_argument("--quantize", action="store_true",
+                        help="dynamic int8 quantization of Linear layers (CPU only)")
+    parser.add_argument("--cache", default="sentiment_cache.sqlite",
+                        help="persistent headline → sentiment cache ('' to disable)")
+    args = parser.parse_args(argv)
+    cache = SentimentCache(args.cache) if args.cache else None
+
+    # Load FinBERT model and tokenizer
+    print("Loading FinBERT model...")
+    scorer = FinbertScorer(args.model, batch_size=args.batch_size,
+                           device=args.device, quantize=args.quantize, cache=cache)
+
+    print(f"Running sentiment analysis on headlines ({scorer.device}, batch={args.batch_size})...")
+    start = time.perf_counter()
+    rows = scorer.score_file(args.input, args.output, chunksize=args.chunksize)
+    elapsed = time.perf_counter() - start
+
+    print(f"✅ Sentiment scores added to {rows:,} rows in {elapsed:.1f}s "
+          f"({rows / max(elapsed, 1e-9):,.0f} rows/s) and saved to {args.output}")
+    if cache is not None:
+        stats = cache.stats()
+        print(f"🗃️ Cache: {stats['hits']:,} hits / {stats['misses']:,} misses "
+              f"({stats['hit_rate']:.1%} hit rate) in {args.cache}")
+        cache.close()
+
+
+if __name__ == "__main__":
+    main()